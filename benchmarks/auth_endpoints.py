@@ -0,0 +1,211 @@
+import argparse
+import asyncio
+import datetime
+import json
+import statistics
+import time
+import uuid
+from http.cookies import SimpleCookie
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+import src.database.redis.connection as redis_connection
+from src.config.auth import AUTH_CONFIG
+from src.config.redis import REDIS_CONFIG
+
+Headers = List[Tuple[bytes, bytes]]
+
+
+def client_address(index: int) -> Tuple[str, int]:
+    return f'10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}', 50000
+
+
+async def asgi_request(
+        app: Any,
+        method: str,
+        path: str,
+        headers: Headers = (),
+        body: bytes = b'',
+        client: Tuple[str, int] = ('127.0.0.1', 50000)
+) -> Tuple[int, Headers]:
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': method, 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'root_path': '', 'query_string': b'',
+        'headers': [(b'content-type', b'application/json'), *headers],
+        'client': client, 'server': ('benchmark', 80),
+    }
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    response = {}
+
+    async def receive():
+        return messages.pop() if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+            response['headers'] = message.get('headers', [])
+
+    await app(scope, receive, send)
+    return response['status'], response['headers']
+
+
+def get_cookies(headers: Headers) -> Dict[str, str]:
+    cookies = SimpleCookie()
+    for key, value in headers:
+        if key == b'set-cookie':
+            cookies.load(value.decode())
+    return {key: morsel.value for key, morsel in cookies.items()}
+
+
+def cookie_header(cookies: Dict[str, str]) -> Headers:
+    return [(b'cookie', '; '.join(f'{key}={value}' for key, value in cookies.items()).encode())]
+
+
+def credentials_body(phone: str) -> bytes:
+    return json.dumps({'phone': phone, 'password': 'benchmark-password', 'role': 'CLIENT'}).encode()
+
+
+async def run_scenario(
+        requests: int,
+        concurrency: int,
+        call: Callable[[int], Awaitable[int]]
+) -> Dict[str, float | int]:
+    latencies = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for index in counter:
+            started_at = time.perf_counter()
+            status = await call(index)
+            latencies.append(time.perf_counter() - started_at)
+            if status >= 400:
+                errors += 1
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+
+    quantiles = statistics.quantiles(latencies, n=100, method='inclusive')
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'errors': errors,
+        'rps': requests / elapsed,
+        'p50_ms': quantiles[49] * 1000,
+        'p95_ms': quantiles[94] * 1000,
+        'p99_ms': quantiles[98] * 1000,
+    }
+
+
+def use_redis(redis_url: str | None):
+    if redis_url is None:
+        try:
+            from fakeredis import FakeServer, aioredis as fake_aioredis
+        except ImportError:
+            raise SystemExit('Install fakeredis[lua] or pass --redis-url to run the benchmark.')
+        REDIS_CONFIG.client_cache_enabled = False
+        redis_connection.REDIS_CONNECTION = fake_aioredis.FakeRedis(server=FakeServer(), decode_responses=True)
+        redis_connection.BOT_REDIS_CONNECTION = fake_aioredis.FakeRedis(server=FakeServer(), decode_responses=True)
+        return None
+
+    redis_connection.REDIS_CONNECTION = redis_connection.aioredis.from_url(redis_url, decode_responses=True)
+    redis_connection.BOT_REDIS_CONNECTION = redis_connection.aioredis.from_url(redis_url, decode_responses=True)
+
+
+async def fill_sessions(sessions: int, batch_size: int = 1000):
+    from src.domain.authentication.dal import AuthenticationDAO
+
+    redis_session = redis_connection.RedisSession()
+    for offset in range(0, sessions, batch_size):
+        await asyncio.gather(*(
+            AuthenticationDAO(redis_session).create_refresh_token(uuid.uuid4(), 'CLIENT')
+            for _ in range(min(batch_size, sessions - offset))
+        ))
+
+
+async def main(args: argparse.Namespace) -> Dict[str, object]:
+    use_redis(args.redis_url)
+    # The app binds REDIS_CONNECTION on import, so it is imported only after the benchmark client is set.
+    import src.api.rest.main as rest_main
+    if rest_main.REDIS_CONNECTION is not redis_connection.REDIS_CONNECTION:
+        raise SystemExit('src.api.rest.main was imported before the benchmark Redis client was set.')
+    app = rest_main.app
+
+    if args.hash_iterations is not None:
+        AUTH_CONFIG.password_hash_iterations = args.hash_iterations
+    if args.no_rate_limit:
+        AUTH_CONFIG.rate_limit_per_phone = AUTH_CONFIG.rate_limit_per_ip = 2 ** 31
+
+    run_id = uuid.uuid4().int % 10 ** 8
+    phones = [f'7{run_id:08d}{index:05d}' for index in range(args.requests)]
+    user_cookies: List[Dict[str, str]] = [{} for _ in range(args.requests)]
+
+    async def sign_up(index: int) -> int:
+        status, headers = await asgi_request(
+            app, 'POST', '/api/v1/sign-up/', body=credentials_body(phones[index]), client=client_address(index)
+        )
+        return status
+
+    async def sign_in(index: int) -> int:
+        status, headers = await asgi_request(
+            app, 'POST', '/api/v1/sign-in/', body=credentials_body(phones[index]), client=client_address(index)
+        )
+        user_cookies[index] = get_cookies(headers)
+        return status
+
+    async def refresh(index: int) -> int:
+        status, headers = await asgi_request(
+            app, 'GET', '/api/v1/refresh/', headers=cookie_header(user_cookies[index])
+        )
+        user_cookies[index] = get_cookies(headers)
+        return status
+
+    async def sign_out(index: int) -> int:
+        status, _ = await asgi_request(app, 'DELETE', '/api/v1/sign-out/', headers=cookie_header(user_cookies[index]))
+        return status
+
+    async with app.router.lifespan_context(app):
+        await fill_sessions(args.sessions)
+        results = {}
+        for name, call in (('sign-up', sign_up), ('sign-in', sign_in), ('refresh', refresh), ('sign-out', sign_out)):
+            results[name] = await run_scenario(args.requests, args.concurrency, call)
+            print(
+                f'{name:>8}: {results[name]["rps"]:9.1f} rps  p50 {results[name]["p50_ms"]:7.2f} ms  '
+                f'p95 {results[name]["p95_ms"]:7.2f} ms  p99 {results[name]["p99_ms"]:7.2f} ms  '
+                f'errors {results[name]["errors"]}'
+            )
+
+    return {
+        'created_at': datetime.datetime.now(datetime.UTC).isoformat(),
+        'parameters': {
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'sessions': args.sessions,
+            'hash_iterations': AUTH_CONFIG.password_hash_iterations,
+            'rate_limit': not args.no_rate_limit,
+            'redis': 'fakeredis' if args.redis_url is None else args.redis_url,
+        },
+        'results': results,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark sign-up, sign-in, refresh and sign-out endpoints. Run alembic upgrade head first.'
+    )
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--sessions', type=int, default=10_000, help='Refresh tokens stored before the run.')
+    parser.add_argument('--hash-iterations', type=int, default=None)
+    parser.add_argument(
+        '--no-rate-limit', action='store_true',
+        help='Raise the sign-up/sign-in rate limits out of reach (each user already gets its own client IP).'
+    )
+    parser.add_argument('--redis-url', default=None, help='Use a real Redis instead of fakeredis.')
+    parser.add_argument('--output', default='bench_output.json')
+    arguments = parser.parse_args()
+
+    report = asyncio.run(main(arguments))
+    with open(arguments.output, 'w', encoding='utf8') as file:
+        json.dump(report, file, indent=2)
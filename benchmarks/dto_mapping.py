@@ -0,0 +1,110 @@
+import argparse
+import asyncio
+import time
+import timeit
+import uuid
+from typing import Awaitable, Callable, List
+
+from src.database.postgres.connection import Session, engine
+from src.domain.abc.dal import get_projection
+from src.domain.user.dal import UserDAO
+from src.domain.user.dto import UserGetDTO, RoleEnum
+from src.domain.user.model import UserModel
+
+
+def user_values(index: int) -> dict:
+    return {
+        'id': uuid.uuid4(),
+        'phone': str(79_000_000_000 + index),
+        'password': 'benchmark-password-hash',
+        'role': RoleEnum.CLIENT.value,
+        'first_name': 'Benchmark',
+        'surname': None,
+        'patronymic': None,
+        'gender': None,
+        'birthdate': None,
+        'tg_id': None,
+    }
+
+
+def mapping_benchmark(rows: int, number: int, repeat: int):
+    values = [user_values(index) for index in range(rows)]
+    models = [UserModel(**item) for item in values]
+    projection = get_projection(UserModel, UserGetDTO)
+    tuples = [tuple(item[field] for field in projection.fields) for item in values]
+
+    def validate_models():
+        return [UserGetDTO.model_validate(model) for model in models]
+
+    def build_projection():
+        return [projection.build(row) for row in tuples]
+
+    for name, func in (('validate', validate_models), ('projection', build_projection)):
+        best = min(timeit.repeat(func, number=number, repeat=repeat)) / number / rows
+        print(f'{name:>10}: {best * 1_000_000:8.2f} us/row')
+
+
+async def measure(
+        name: str,
+        rows: int,
+        repeat: int,
+        call: Callable[[UserDAO], Awaitable[List | None]],
+        setup: Callable[[UserDAO], Awaitable[List | None]] | None = None
+):
+    timings = {}
+    for projected in (False, True):
+        best = None
+        for _ in range(repeat):
+            async with Session() as session:
+                dao = UserDAO(session)
+                dao.projected = projected
+                if setup is not None:
+                    await setup(dao)
+                started_at = time.perf_counter()
+                await call(dao)
+                elapsed = time.perf_counter() - started_at
+                await session.rollback()
+            best = elapsed if best is None else min(best, elapsed)
+        timings['projection' if projected else 'validate'] = best
+
+    for path, elapsed in timings.items():
+        print(f'{name:>14} {path:>10}: {elapsed / rows * 1_000_000:8.2f} us/row')
+
+
+async def postgres_benchmark(rows: int, repeat: int):
+    data = [user_values(index) for index in range(rows)]
+    user_id = data[0]['id']
+
+    async def insert(dao: UserDAO):
+        await dao.create_list(data, with_returning=False)
+
+    async def create_list(dao: UserDAO):
+        await dao.create_list(data)
+
+    async def get_list(dao: UserDAO):
+        await dao.get_list()
+
+    async def get_dto_by_id(dao: UserDAO):
+        for _ in range(rows):
+            await dao.get_dto_by_id(user_id)
+
+    await measure('create_list', rows, repeat, create_list)
+    await measure('get_list', rows, repeat, get_list, insert)
+    await measure('get_dto_by_id', rows, repeat, get_dto_by_id, insert)
+    await engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Measure per-row cost of ORM-to-DTO mapping.')
+    parser.add_argument('--rows', type=int, default=1_000)
+    parser.add_argument('--number', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument(
+        '--postgres', action='store_true',
+        help='Also time UserDAO calls against the configured database (empty user_table) in rolled back transactions.'
+    )
+    args = parser.parse_args()
+
+    mapping_benchmark(args.rows, args.number, args.repeat)
+    if args.postgres:
+        asyncio.run(postgres_benchmark(args.rows, args.repeat))
@@ -0,0 +1,44 @@
+import argparse
+import timeit
+import uuid
+
+from starlette.responses import Response
+
+from src.config.auth import AUTH_CONFIG
+from src.domain.authentication.dto import AccessTokenDTO
+from src.domain.authentication.service import JWT, REFRESH_COOKIE, issue_access_token
+from src.domain.user.dto import RoleEnum
+
+USER_ID = uuid.uuid4()
+REFRESH_TOKEN = str(uuid.uuid4())
+
+
+def issue_with_models():
+    response = Response()
+    response.set_cookie(
+        AUTH_CONFIG.refresh_key, REFRESH_TOKEN, AUTH_CONFIG.refresh_exp_sec, **AUTH_CONFIG.cookies_kwargs()
+    )
+    access_payload = AccessTokenDTO.access_fabric(USER_ID, RoleEnum.CLIENT, AUTH_CONFIG.access_exp_sec)
+    response.set_cookie(
+        AUTH_CONFIG.access_key,
+        JWT.encode(claims=access_payload.model_dump(mode='json')),
+        AUTH_CONFIG.access_exp_sec,
+        **AUTH_CONFIG.cookies_kwargs()
+    )
+
+
+def issue_fast_path():
+    response = Response()
+    REFRESH_COOKIE.set(response, REFRESH_TOKEN)
+    issue_access_token(response, USER_ID, RoleEnum.CLIENT)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Measure per-call cost of access token issuance.')
+    parser.add_argument('--number', type=int, default=20_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    for name, func in (('models', issue_with_models), ('fast path', issue_fast_path)):
+        best = min(timeit.repeat(func, number=args.number, repeat=args.repeat)) / args.number
+        print(f'{name:>10}: {best * 1_000_000:8.2f} us/call')
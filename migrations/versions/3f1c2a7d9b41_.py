@@ -0,0 +1,27 @@
+"""add admin role
+
+Revision ID: 3f1c2a7d9b41
+Revises: 87dedc1be58d
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a7d9b41'
+down_revision: Union[str, None] = '87dedc1be58d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    role_model = sa.table('role_table', sa.column('name', sa.String(length=8)))
+    op.bulk_insert(role_model, [{'name': 'ADMIN'}])
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM role_table WHERE name = 'ADMIN'")
@@ -0,0 +1,39 @@
+"""active user partial indexes
+
+Revision ID: b52e7c9a1d04
+Revises: 3f1c2a7d9b41
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b52e7c9a1d04'
+down_revision: Union[str, None] = '3f1c2a7d9b41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE_INDEXES = (
+    ('ix_user_table_phone_active', ['phone']),
+    ('ix_user_table_tg_id_active', ['tg_id']),
+    ('ix_user_table_role_active', ['role', 'id']),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns in ACTIVE_INDEXES:
+            op.create_index(
+                name, 'user_table', columns, unique=False, if_not_exists=True,
+                postgresql_where=sa.text('deleted_at IS NULL'), postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in ACTIVE_INDEXES:
+            op.drop_index(name, table_name='user_table', if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,45 @@
+from typing import Dict
+
+from fastapi import APIRouter
+from starlette import status
+from starlette.responses import JSONResponse
+
+
+class Readiness:
+    __slots__ = ('checks',)
+
+    def __init__(self):
+        self.checks: Dict[str, bool] = {}
+
+    def set(self, name: str, ready: bool):
+        self.checks[name] = ready
+
+    @property
+    def is_ready(self) -> bool:
+        return len(self.checks) > 0 and all(self.checks.values())
+
+
+READINESS = Readiness()
+
+health_rest = APIRouter(
+    tags=["Health"],
+)
+
+
+@health_rest.get(
+    path='/healthz',
+    include_in_schema=False,
+)
+async def get_liveness():
+    return {'status': 'ok'}
+
+
+@health_rest.get(
+    path='/readyz',
+    include_in_schema=False,
+)
+async def get_readiness():
+    return JSONResponse(
+        {'ready': READINESS.is_ready, 'checks': READINESS.checks},
+        status_code=status.HTTP_200_OK if READINESS.is_ready else status.HTTP_503_SERVICE_UNAVAILABLE
+    )
@@ -1,32 +1,107 @@
-import os
+import asyncio
+import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, APIRouter
 from starlette.middleware.cors import CORSMiddleware
 
+from src.api.rest.health import health_rest, READINESS
+from src.api.rest.metrics import metrics_rest, MetricsMiddleware
 from src.api.rest.v1.authentications import auth_rest_v1
+from src.api.rest.v1.jwks import jwks_rest_v1
+from src.api.rest.v1.users import users_rest_v1
 from src.config.app import APP_CONFIG
-from src.database.redis.connection import REDIS_CONNECTION
+from src.database.postgres.connection import engine, warmup_pool
+from src.database.postgres.migration import is_schema_current, upgrade_schema
+from src.database.redis.connection import REDIS_CONNECTION, BOT_REDIS_CONNECTION, CLIENT_CACHE, RedisSession
+from src.domain.authentication.dal import AuthenticationDAO
+from src.domain.authentication.service import HASH_EXECUTOR
+from src.domain.user.filter import PHONE_FILTER
 from src.utils.router import include_routers
 
+logger = logging.getLogger(__name__)
+
+v1_routers = [
+    auth_rest_v1,
+    jwks_rest_v1,
+    users_rest_v1,
+]
+
+v1_router = include_routers(APIRouter(prefix='/v1'), v1_routers)
+main_router = include_routers(APIRouter(prefix='/api'), (v1_router,))
+
+
+async def wait_for_schema():
+    if APP_CONFIG.migrations == 'skip':
+        READINESS.set('schema', True)
+        return None
+    if APP_CONFIG.migrations == 'upgrade':
+        try:
+            await upgrade_schema()
+        except Exception:
+            logger.exception('Database migration failed.')
+
+    while not await is_schema_current():
+        logger.warning('Database schema is not at the head revision, waiting for migrations.')
+        READINESS.set('schema', False)
+        await asyncio.sleep(APP_CONFIG.schema_poll_sec)
+    READINESS.set('schema', True)
+
+
+async def migrate_refresh_tokens():
+    if APP_CONFIG.migrations == 'skip':
+        return None
+    authentication_dao = AuthenticationDAO(RedisSession())
+    if await authentication_dao.is_migrated() or not await authentication_dao.lock_migration():
+        return None
+
+    try:
+        migrated = 0
+        async for _ in authentication_dao.migrate_legacy_tokens():
+            migrated += 1
+        logger.warning('Migrated %d refresh token keys from an older layout.', migrated)
+    finally:
+        await authentication_dao.unlock_migration()
+
+
+async def prepare_database():
+    await wait_for_schema()
+    try:
+        await PHONE_FILTER.ensure_built()
+    except Exception:
+        logger.exception('Phone filter build failed.')
+    try:
+        await migrate_refresh_tokens()
+    except Exception:
+        logger.exception('Refresh token migration failed, run python -m src.cli.migrate_refresh_tokens.')
+
 
 @asynccontextmanager
 async def lifespan(app_: FastAPI):
-    os.system('alembic upgrade head')
-
-    v1_routers = [
-        auth_rest_v1
-    ]
+    READINESS.set('schema', False)
+    READINESS.set('postgres', False)
+    READINESS.set('redis', False)
+    schema_task = asyncio.create_task(prepare_database())
 
-    v1_router = include_routers(APIRouter(prefix='/v1'), v1_routers)
-    main_router = include_routers(APIRouter(prefix='/api'), (v1_router,))
-    app_.include_router(main_router)
+    await warmup_pool()
+    READINESS.set('postgres', True)
+    await REDIS_CONNECTION.ping()
+    READINESS.set('redis', True)
+    await CLIENT_CACHE.start()
 
     yield
-    await REDIS_CONNECTION.connection.aclose()
+    schema_task.cancel()
+    await CLIENT_CACHE.stop()
+    await REDIS_CONNECTION.aclose()
+    await BOT_REDIS_CONNECTION.aclose()
+    await engine.dispose()
+    HASH_EXECUTOR.shutdown()
 
 
 app = FastAPI(debug=APP_CONFIG.debug, lifespan=lifespan)
+app.include_router(main_router)
+app.include_router(metrics_rest)
+app.include_router(health_rest)
 
 app.add_middleware(
     CORSMiddleware,
@@ -35,3 +110,4 @@ app.add_middleware(
     allow_headers=['*'],
     allow_credentials=True
 )
+app.add_middleware(MetricsMiddleware)
@@ -0,0 +1,52 @@
+import time
+
+from fastapi import APIRouter
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
+
+from src.utils.metrics import REGISTRY
+
+HTTP_LATENCY = REGISTRY.histogram('http_request_seconds', 'Latency of HTTP requests.', ('method', 'route', 'status'))
+
+metrics_rest = APIRouter(
+    tags=["Metrics"],
+)
+
+
+@metrics_rest.get(
+    path='/metrics',
+    include_in_schema=False,
+)
+async def get_metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type='text/plain; version=0.0.4')
+
+
+class MetricsMiddleware:
+    __slots__ = ('app',)
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+
+        status = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get('route')
+            HTTP_LATENCY.observe(
+                time.perf_counter() - started_at,
+                scope['method'],
+                route.path if route is not None else 'unmatched',
+                str(status)
+            )
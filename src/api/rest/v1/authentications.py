@@ -1,11 +1,12 @@
+import fastapi
 from fastapi import APIRouter
 from starlette import status
 from starlette.responses import Response
 
 from src.database.redis.depends import get_redis_session
 from src.domain.authentication.depends import validate_user_credentials_depends, delete_tokens_depends, \
-    update_tokens_depends
-from src.domain.authentication.service import create_tokens
+    update_tokens_depends, validate_telegram_user_depends, link_telegram_user_depends
+from src.domain.authentication.service import create_tokens, acquire_hashing_slot, check_bot
 from src.domain.user.depends import user_create_depends
 
 auth_rest_v1 = APIRouter(
@@ -15,7 +16,8 @@ auth_rest_v1 = APIRouter(
 
 @auth_rest_v1.post(
     path='/sign-up/',
-    status_code=status.HTTP_204_NO_CONTENT
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[fastapi.Depends(acquire_hashing_slot)],
 )
 async def sign_up(
         response: Response,
@@ -28,6 +30,7 @@ async def sign_up(
 @auth_rest_v1.post(
     path='/sign-in/',
     status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[fastapi.Depends(acquire_hashing_slot)],
 )
 async def sign_in(
         response: Response,
@@ -37,6 +40,32 @@ async def sign_in(
     await create_tokens(response, user.id, user.role, redis_session)
 
 
+@auth_rest_v1.post(
+    path='/telegram/sign-in/',
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[fastapi.Depends(check_bot)],
+)
+async def telegram_sign_in(
+        response: Response,
+        user: validate_telegram_user_depends,
+        redis_session: get_redis_session
+):
+    await create_tokens(response, user.id, user.role, redis_session)
+
+
+@auth_rest_v1.post(
+    path='/telegram/link/',
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[fastapi.Depends(check_bot), fastapi.Depends(acquire_hashing_slot)],
+)
+async def telegram_link(
+        response: Response,
+        user: link_telegram_user_depends,
+        redis_session: get_redis_session
+):
+    await create_tokens(response, user.id, user.role, redis_session)
+
+
 @auth_rest_v1.delete(
     path='/sign-out/',
     status_code=status.HTTP_204_NO_CONTENT,
@@ -0,0 +1,20 @@
+from fastapi import APIRouter
+from starlette.responses import Response
+
+from src.config.auth import AUTH_CONFIG
+from src.domain.authentication.keys import SIGNING_KEYS
+
+jwks_rest_v1 = APIRouter(
+    tags=["Keys"],
+)
+
+
+@jwks_rest_v1.get(
+    path='/.well-known/jwks.json',
+)
+async def get_jwks():
+    return Response(
+        content=SIGNING_KEYS.jwks_body,
+        media_type='application/json',
+        headers={'Cache-Control': f'public, max-age={AUTH_CONFIG.jwks_max_age_sec}'}
+    )
@@ -0,0 +1,58 @@
+from typing import Annotated, Literal
+from uuid import UUID
+
+import fastapi
+from fastapi import APIRouter
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+
+from src.config.postgres import POSTGRES_CONFIG
+from src.database.postgres.depends import get_session
+from src.domain.authentication.service import RoleFilter
+from src.domain.user.dto import RoleEnum, UserImportReportDTO, UserPageDTO
+from src.domain.user.permission import PermissionEnum
+from src.domain.user.service import import_users, list_users, export_users
+from src.utils.generator import line_generator
+
+users_rest_v1 = APIRouter(
+    prefix='/users',
+    tags=["Users"],
+)
+
+EXPORT_MEDIA_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json',
+}
+
+
+@users_rest_v1.get(
+    path='/',
+    dependencies=[fastapi.Depends(RoleFilter(permissions=[PermissionEnum.USERS_READ]))],
+)
+async def get_users(
+        session: get_session,
+        role: RoleEnum | None = None,
+        after: UUID | None = None,
+        limit: Annotated[int, fastapi.Query(ge=1, le=POSTGRES_CONFIG.page_max_size)] = POSTGRES_CONFIG.page_size
+) -> UserPageDTO:
+    return await list_users(session, role, after, limit)
+
+
+@users_rest_v1.get(
+    path='/export/',
+    dependencies=[fastapi.Depends(RoleFilter(permissions=[PermissionEnum.USERS_READ]))],
+)
+async def export_users_stream(
+        role: RoleEnum | None = None,
+        file_format: Annotated[Literal['ndjson', 'json'], fastapi.Query(alias='format')] = 'ndjson'
+) -> StreamingResponse:
+    return StreamingResponse(export_users(role, file_format), media_type=EXPORT_MEDIA_TYPES[file_format])
+
+
+@users_rest_v1.post(
+    path='/import/',
+    dependencies=[fastapi.Depends(RoleFilter(permissions=[PermissionEnum.USERS_WRITE]))],
+)
+async def import_users_stream(request: Request) -> UserImportReportDTO:
+    file_format = 'csv' if request.headers.get('content-type', '').startswith('text/csv') else 'jsonl'
+    return await import_users(line_generator(request.stream()), file_format)
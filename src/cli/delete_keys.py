@@ -0,0 +1,21 @@
+import argparse
+import asyncio
+
+from src.config.redis import REDIS_CONFIG
+from src.database.redis.connection import REDIS_CONNECTION, RedisSession
+
+
+async def main(pattern: str, batch_size: int, sleep_sec: float):
+    deleted = await RedisSession().delete_values(pattern, batch_size, sleep_sec)
+    print(f'Deleted keys: {deleted}')
+    await REDIS_CONNECTION.aclose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Delete Redis keys matching a pattern without blocking Redis.')
+    parser.add_argument('pattern')
+    parser.add_argument('--batch-size', type=int, default=REDIS_CONFIG.scan_batch_size)
+    parser.add_argument('--sleep-sec', type=float, default=REDIS_CONFIG.delete_sleep_sec)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.pattern, args.batch_size, args.sleep_sec))
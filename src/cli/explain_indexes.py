@@ -0,0 +1,55 @@
+import asyncio
+import sys
+from typing import Awaitable, Callable, Dict, List, Tuple, Any
+
+from sqlalchemy import event, text
+
+from src.database.postgres.connection import Session, engine
+from src.domain.user.dal import UserDAO
+from src.domain.user.dto import RoleEnum
+
+HOT_QUERIES: Dict[str, Callable[[UserDAO], Awaitable[Any]]] = {
+    'ix_user_table_phone_active': lambda dao: dao.get_by_phone('0000'),
+    'ix_user_table_tg_id_active': lambda dao: dao.get_by_tg_id(0),
+    'ix_user_table_role_active': lambda dao: dao.get_by_role(RoleEnum.ADMIN),
+}
+
+
+async def explain(call: Callable[[UserDAO], Awaitable[Any]]) -> List[str]:
+    statements: List[Tuple[str, Any]] = []
+
+    def capture(connection, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    async with Session() as session:
+        connection = await session.connection()
+        await connection.execute(text('SET LOCAL enable_seqscan = off'))
+        event.listen(connection.sync_connection, 'before_cursor_execute', capture)
+        try:
+            await call(UserDAO(session))
+        finally:
+            event.remove(connection.sync_connection, 'before_cursor_execute', capture)
+
+        plans = [
+            (await connection.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {statement}', parameters)).scalar()
+            for statement, parameters in statements
+        ]
+        await session.rollback()
+    return [str(plan) for plan in plans]
+
+
+async def main() -> int:
+    missing = 0
+    for index, call in HOT_QUERIES.items():
+        plans = await explain(call)
+        used = any(index in plan for plan in plans)
+        missing += not used
+        print(f'{index}: {"used" if used else "NOT USED"}')
+        if not used:
+            print('\n'.join(plans))
+    await engine.dispose()
+    return 1 if missing > 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
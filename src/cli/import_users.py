@@ -0,0 +1,35 @@
+import argparse
+import asyncio
+from typing import AsyncIterator
+
+from src.database.postgres.connection import engine
+from src.domain.authentication.service import HASH_EXECUTOR
+from src.domain.user.dto import UserImportIssueDTO
+from src.domain.user.service import import_users
+
+
+async def read_lines(path: str) -> AsyncIterator[str]:
+    with open(path, encoding='utf8') as file:
+        for line in file:
+            yield line.rstrip('\r\n')
+
+
+def print_issue(kind: str, issue: UserImportIssueDTO):
+    print(f'line {issue.line}: {issue.detail}')
+
+
+async def main(path: str, file_format: str, chunk_size: int):
+    report = await import_users(read_lines(path), file_format, chunk_size, print_issue)
+    print(f'Created: {report.created}, conflicts: {report.conflicted}, errors: {report.failed}')
+    await engine.dispose()
+    HASH_EXECUTOR.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Import users from a CSV or JSONL file.')
+    parser.add_argument('path')
+    parser.add_argument('--format', choices=('csv', 'jsonl'), default=None)
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.path, args.format or ('csv' if args.path.endswith('.csv') else 'jsonl'), args.chunk_size))
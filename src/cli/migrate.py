@@ -0,0 +1,13 @@
+import asyncio
+
+from src.database.postgres.connection import engine
+from src.database.postgres.migration import upgrade_schema
+
+
+async def main():
+    await upgrade_schema()
+    await engine.dispose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
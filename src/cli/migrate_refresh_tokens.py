@@ -0,0 +1,32 @@
+import argparse
+import asyncio
+import sys
+
+from src.database.redis.connection import REDIS_CONNECTION, RedisSession
+from src.domain.authentication.dal import AuthenticationDAO
+
+
+async def main(check: bool) -> int:
+    dao = AuthenticationDAO(RedisSession())
+    if check:
+        legacy = await dao.count_legacy_tokens()
+        print(f'Refresh token keys in an older layout: {legacy}')
+    else:
+        legacy = 0
+        async for _ in dao.migrate_legacy_tokens():
+            legacy += 1
+        print(f'Migrated refresh tokens: {legacy}')
+    await REDIS_CONNECTION.aclose()
+    return 1 if check and legacy > 0 else 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Move refresh token keys from older layouts to the current one. Startup runs this once per Redis.'
+    )
+    parser.add_argument(
+        '--check', action='store_true', help='Only count keys in an older layout and exit 1 if any are left.'
+    )
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(main(args.check)))
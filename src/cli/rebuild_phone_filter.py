@@ -0,0 +1,18 @@
+import asyncio
+
+from src.database.postgres.connection import engine
+from src.database.redis.connection import REDIS_CONNECTION
+from src.domain.user.filter import PHONE_FILTER
+
+
+async def main():
+    added = await PHONE_FILTER.rebuild()
+    info = await PHONE_FILTER.get_info()
+    print(f'Phones added: {added}')
+    print(', '.join(f'{key}: {value}' for key, value in info.items()))
+    await engine.dispose()
+    await REDIS_CONNECTION.aclose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
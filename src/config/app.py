@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -9,5 +11,8 @@ class AppConfig(BaseSettings):
 
     debug: bool = True
 
+    migrations: Literal['check', 'upgrade', 'skip'] = 'check'
+    schema_poll_sec: int = 5
+
 
 APP_CONFIG = AppConfig()
@@ -1,5 +1,7 @@
-from typing import Dict, Any
+import os
+from typing import Dict, Any, Literal
 
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -8,14 +10,39 @@ class AuthConfig(BaseSettings):
 
     secret: str = 'secret'
     algorithm: str = 'HS256'
+    keys_dir: str | None = None
+    active_kid: str | None = None
+    jwks_max_age_sec: int = 60 * 5
 
     session_ttl_sec: int = 60 * 15
 
     refresh_key: str = 'refresh'
     refresh_exp_sec: int = 60 * 60 * 24 * 14
+    refresh_reuse_grace_sec: int = 10
 
     access_key: str = 'access'
     access_exp_sec: int = 60 * 2
+    access_cache_size: int = 10_000
+
+    password_hash_iterations: int = 600_000
+
+    hash_workers: int = 0
+    hash_start_method: Literal['forkserver', 'spawn'] = 'forkserver'
+    web_concurrency: int = Field(1, validation_alias='web_concurrency')
+    hash_max_in_flight: int = 0
+    hash_concurrency_limit: int = 64  # per worker process, not shared between workers
+
+    rate_limit_window_sec: int = 60
+    rate_limit_per_phone: int = 10
+    rate_limit_per_ip: int = 100
+
+    bot_secret: str | None = None
+    bot_header: str = 'X-Bot-Token'
+
+    def get_hash_workers(self) -> int:
+        if self.hash_workers > 0:
+            return self.hash_workers
+        return max(1, (os.cpu_count() or 1) // max(1, self.web_concurrency))
 
     def cookies_kwargs(self) -> Dict[str, Any]:
         kwargs = {
@@ -0,0 +1,22 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class CacheConfig(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix='cache_')
+
+    credentials_enabled: bool = False
+    credentials_ttl_sec: int = 30
+    credentials_max_size: int = 10_000
+    credentials_redis: bool = False
+    credentials_redis_ttl_sec: int = 60 * 5
+
+    phone_filter_enabled: bool = True
+    phone_filter_capacity: int = 1_000_000
+    phone_filter_error_rate: float = 0.01
+    phone_filter_build_lock_sec: int = 60 * 10
+
+    telegram_enabled: bool = True
+    telegram_ttl_sec: int = 60 * 60 * 24
+
+
+CACHE_CONFIG = CacheConfig()
@@ -1,5 +1,7 @@
+from typing import Dict, Any
+
 from pydantic_settings import BaseSettings
-from sqlalchemy import URL
+from sqlalchemy import URL, NullPool
 
 
 class PostgresConfig(BaseSettings):
@@ -11,6 +13,17 @@ class PostgresConfig(BaseSettings):
     password: str = 'postgres'
     ddl_show: bool = False
 
+    pool_size: int = 10
+    pool_max_overflow: int = 10
+    pool_recycle_sec: int = 60 * 30
+    pool_pre_ping: bool = True
+    pool_timeout_sec: float = 30
+    pool_warmup: bool = True
+
+    page_size: int = 100
+    page_max_size: int = 1000
+    stream_batch_size: int = 1000
+
     def connection_url(self) -> URL:
         return URL.create(
             drivername=self.driver,
@@ -21,5 +34,16 @@ class PostgresConfig(BaseSettings):
             database=self.db,
         )
 
+    def get_engine_attributes(self) -> Dict[str, Any]:
+        if self.pool_size < 1:
+            return {'poolclass': NullPool}
+        return {
+            'pool_size': self.pool_size,
+            'max_overflow': self.pool_max_overflow,
+            'pool_recycle': self.pool_recycle_sec,
+            'pool_pre_ping': self.pool_pre_ping,
+            'pool_timeout': self.pool_timeout_sec,
+        }
+
 
 POSTGRES_CONFIG = PostgresConfig(_env_file='.env', _env_prefix='POSTGRES_')
@@ -1,3 +1,5 @@
+from typing import Literal, Tuple
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -13,15 +15,44 @@ class RedisConfig(BaseSettings):
     bot_index: int = 2
     encoding: str = 'utf8'
     decode_responses: bool = True
+    cluster: bool = False
+    protocol: Literal[2, 3] = 2
+
+    max_connections: int = 64
+    pool_timeout_sec: float = 2.0
+    socket_timeout_sec: float = 2.0
+    socket_connect_timeout_sec: float = 2.0
+    socket_keepalive: bool = True
+    health_check_interval_sec: int = 30
+    retry_attempts: int = 2
+    retry_backoff_base_sec: float = 0.01
+    retry_backoff_cap_sec: float = 0.2
+
+    client_cache_enabled: bool = False
+    client_cache_prefixes: Tuple[str, ...] = ('user_credentials',)
+    client_cache_max_size: int = 10_000
+    client_cache_ttl_sec: int = 60
+    client_cache_reconnect_sec: float = 1.0
+
+    scan_batch_size: int = 500
+    delete_sleep_sec: float = 0.01
 
-    def get_redis_attributes(self, index: int) -> dict[str, str | int | bool]:
+    def get_redis_attributes(self, index: int) -> dict[str, str | int | float | bool]:
         return {
             'url': self.get_connection_url(index),
             'encoding': self.encoding,
             'decode_responses': self.decode_responses,
+            'protocol': self.protocol,
+            'max_connections': self.max_connections,
+            'socket_timeout': self.socket_timeout_sec,
+            'socket_connect_timeout': self.socket_connect_timeout_sec,
+            'socket_keepalive': self.socket_keepalive,
+            'health_check_interval': self.health_check_interval_sec,
         }
 
     def get_connection_url(self, index: int) -> str:
+        if self.cluster:
+            return f'{self.driver}://{self.user}:{self.password}@{self.host}:{self.port}'
         return f'{self.driver}://{self.user}:{self.password}@{self.host}:{self.port}//{index}'
 
 
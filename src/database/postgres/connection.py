@@ -1,22 +1,110 @@
-from typing import Generator
+import asyncio
+import logging
+import time
+from typing import Generator, Dict
 
-from sqlalchemy import NullPool
+from sqlalchemy import QueuePool, event
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 
 from src.config.postgres import POSTGRES_CONFIG
+from src.utils.metrics import REGISTRY
 
 
-engine = create_async_engine(POSTGRES_CONFIG.connection_url(), poolclass=NullPool, echo=False)
+logger = logging.getLogger(__name__)
+
+engine = create_async_engine(POSTGRES_CONFIG.connection_url(), echo=False, **POSTGRES_CONFIG.get_engine_attributes())
 Session = async_sessionmaker(engine)
 
 
+class PoolStatistics:
+    __slots__ = ('acquired', 'wait_sec_total', 'wait_sec_max')
+
+    def __init__(self):
+        self.acquired = 0
+        self.wait_sec_total = 0.0
+        self.wait_sec_max = 0.0
+
+    def record_wait(self, wait_sec: float):
+        self.acquired += 1
+        self.wait_sec_total += wait_sec
+        if wait_sec > self.wait_sec_max:
+            self.wait_sec_max = wait_sec
+
+    def as_dict(self) -> Dict[str, int | float]:
+        statistics = {
+            'acquired': self.acquired,
+            'wait_sec_total': self.wait_sec_total,
+            'wait_sec_max': self.wait_sec_max,
+        }
+        pool = engine.sync_engine.pool
+        if isinstance(pool, QueuePool):
+            statistics.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=pool.overflow(),
+            )
+        return statistics
+
+
+POOL_STATISTICS = PoolStatistics()
+
+POSTGRES_SESSION_LATENCY = REGISTRY.histogram('postgres_session_seconds', 'Duration of Postgres session transactions.')
+POSTGRES_QUERY_LATENCY = REGISTRY.histogram('postgres_query_seconds', 'Latency of Postgres statements.', ('statement',))
+POSTGRES_POOL_WAIT = REGISTRY.histogram('postgres_pool_wait_seconds', 'Time spent waiting for a pooled connection.')
+REGISTRY.gauge(
+    'postgres_pool', 'Postgres connection pool statistics.', ('statistic',),
+    lambda: {(key,): value for key, value in POOL_STATISTICS.as_dict().items()}
+)
+
+
+@event.listens_for(engine.sync_engine, 'before_cursor_execute')
+def before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+    connection.info.setdefault('query_started_at', []).append(time.perf_counter())
+
+
+@event.listens_for(engine.sync_engine, 'after_cursor_execute')
+def after_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+    POSTGRES_QUERY_LATENCY.observe(
+        time.perf_counter() - connection.info['query_started_at'].pop(), statement.split(None, 1)[0].upper()
+    )
+
+
+@event.listens_for(engine.sync_engine, 'handle_error')
+def handle_error(exception_context):
+    if exception_context.connection is not None and exception_context.connection.info.get('query_started_at'):
+        exception_context.connection.info['query_started_at'].pop()
+
+
+async def warmup_pool():
+    if not POSTGRES_CONFIG.pool_warmup or POSTGRES_CONFIG.pool_size < 1:
+        return None
+    connections = await asyncio.gather(*(engine.connect() for _ in range(POSTGRES_CONFIG.pool_size)))
+    await asyncio.gather(*(connection.close() for connection in connections))
+
+
+async def run_after_commit(session: AsyncSession):
+    for callback in session.info.pop('after_commit', ()):
+        try:
+            await callback()
+        except Exception:
+            logger.exception('Post-commit callback failed.')
+
+
 async def get_session_generator() -> Generator[AsyncSession, None, None]:
     session = None
     try:
         session = Session()
         async with session.begin():
+            started_at = time.perf_counter()
+            await session.connection()
+            wait_sec = time.perf_counter() - started_at
+            POOL_STATISTICS.record_wait(wait_sec)
+            POSTGRES_POOL_WAIT.observe(wait_sec)
             yield session
         await session.commit()
+        POSTGRES_SESSION_LATENCY.observe(time.perf_counter() - started_at)
+        await run_after_commit(session)
     except Exception as e:
         await session.rollback()
         raise e
@@ -0,0 +1,43 @@
+import asyncio
+import functools
+
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from src.database.postgres.connection import engine
+
+ALEMBIC_CONFIG_PATH: str = 'alembic.ini'
+MIGRATION_LOCK_ID: int = 87_000_001
+
+
+@functools.cache
+def get_head_revision() -> str | None:
+    return ScriptDirectory.from_config(Config(ALEMBIC_CONFIG_PATH)).get_current_head()
+
+
+async def get_current_revision() -> str | None:
+    try:
+        async with engine.connect() as connection:
+            return await connection.scalar(text('SELECT version_num FROM alembic_version'))
+    except DBAPIError:
+        return None
+
+
+async def is_schema_current() -> bool:
+    return await get_current_revision() == get_head_revision()
+
+
+async def upgrade_schema():
+    async with engine.connect() as connection:
+        await connection.execute(text('SELECT pg_advisory_lock(:lock_id)'), {'lock_id': MIGRATION_LOCK_ID})
+        try:
+            if await is_schema_current():
+                return None
+            process = await asyncio.create_subprocess_exec('alembic', '-c', ALEMBIC_CONFIG_PATH, 'upgrade', 'head')
+            if await process.wait() != 0:
+                raise RuntimeError('alembic upgrade head failed.')
+        finally:
+            await connection.execute(text('SELECT pg_advisory_unlock(:lock_id)'), {'lock_id': MIGRATION_LOCK_ID})
+            await connection.commit()
@@ -1,48 +1,286 @@
+import asyncio
 import datetime
-from typing import List
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import List, AsyncIterator, Dict, Iterable, Any
 
 from redis import asyncio as aioredis
+from redis.asyncio.client import Pipeline
+from redis.commands.core import AsyncScript
+from redis.asyncio.retry import Retry
+from redis.backoff import EqualJitterBackoff
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
 
-from src.config.redis import REDIS_CONFIG
-from src.utils.generator import sleep_generator
+from src.config.redis import REDIS_CONFIG, RedisConfig
+from src.utils.cache import TTLCache
+from src.utils.metrics import REGISTRY, observe_latency
 from src.utils.time import get_now_with_delta
 
+logger = logging.getLogger(__name__)
 
-REDIS_CONNECTION = aioredis.from_url(**REDIS_CONFIG.get_redis_attributes(REDIS_CONFIG.api_index))
+
+def create_redis_connection(index: int) -> aioredis.Redis | aioredis.RedisCluster:
+    attributes = REDIS_CONFIG.get_redis_attributes(index)
+    attributes.update(
+        retry=Retry(
+            EqualJitterBackoff(cap=REDIS_CONFIG.retry_backoff_cap_sec, base=REDIS_CONFIG.retry_backoff_base_sec),
+            REDIS_CONFIG.retry_attempts
+        ),
+        retry_on_error=[RedisConnectionError, RedisTimeoutError],
+    )
+    if REDIS_CONFIG.cluster:
+        return aioredis.RedisCluster.from_url(**attributes)
+
+    pool = aioredis.BlockingConnectionPool.from_url(timeout=REDIS_CONFIG.pool_timeout_sec, **attributes)
+    return aioredis.Redis.from_pool(pool)
+
+
+REDIS_CONNECTION = create_redis_connection(REDIS_CONFIG.api_index)
+BOT_REDIS_CONNECTION = create_redis_connection(REDIS_CONFIG.bot_index)
+REDIS_LATENCY = REGISTRY.histogram('redis_operation_seconds', 'Latency of RedisSession operations.', ('operation',))
+
+
+def get_pool_statistics() -> Dict[str, int]:
+    if REDIS_CONFIG.cluster:
+        nodes = REDIS_CONNECTION.get_nodes()
+        opened = sum(len(getattr(node, '_connections', ())) for node in nodes)
+        available = sum(len(getattr(node, '_free', ())) for node in nodes)
+        return {
+            'max_connections': sum(node.max_connections for node in nodes),
+            'in_use': opened - available,
+            'available': available,
+            'open': opened,
+        }
+
+    pool = REDIS_CONNECTION.connection_pool
+    in_use = len(getattr(pool, '_in_use_connections', ()))
+    available = len([
+        connection for connection in getattr(pool, '_available_connections', ()) if connection is not None
+    ])
+    return {
+        'max_connections': pool.max_connections,
+        'in_use': in_use,
+        'available': available,
+        'open': in_use + available,
+    }
+
+
+REGISTRY.gauge(
+    'redis_pool', 'Redis connection pool statistics.', ('statistic',),
+    lambda: {(key,): value for key, value in get_pool_statistics().items()}
+)
+
+
+class ClientCache:
+    channel: str = '__redis__:invalidate'
+
+    def __init__(self, config: RedisConfig):
+        self.config = config
+        self.values = TTLCache[str, str](config.client_cache_max_size, config.client_cache_ttl_sec)
+        self.generation = 0
+        self.tracking = False
+        self.listener: asyncio.Task | None = None
+
+    def is_cached(self, key: str) -> bool:
+        return self.tracking and key.startswith(self.config.client_cache_prefixes)
+
+    def get(self, key: str) -> str | None:
+        return self.values.get(key)
+
+    def set(self, key: str, value: str | None, generation: int):
+        if value is not None and self.tracking and generation == self.generation:
+            self.values.set(key, value)
+
+    def invalidate(self, keys: Iterable[str] | None):
+        self.generation += 1
+        if keys is None:
+            self.values.clear()
+            return None
+        for key in keys:
+            self.values.delete(key)
+
+    async def start(self):
+        if not self.config.client_cache_enabled or self.config.cluster or self.listener is not None:
+            return None
+        self.listener = asyncio.create_task(self.listen())
+
+    async def stop(self):
+        if self.listener is None:
+            return None
+        self.listener.cancel()
+        try:
+            await self.listener
+        except asyncio.CancelledError:
+            pass
+        self.listener = None
+
+    async def listen(self):
+        while True:
+            try:
+                await self.track()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception('Redis client cache tracking failed.')
+            finally:
+                self.tracking = False
+                self.invalidate(None)
+            await asyncio.sleep(self.config.client_cache_reconnect_sec)
+
+    async def track(self):
+        async with REDIS_CONNECTION.pubsub(ignore_subscribe_messages=True) as pubsub:
+            await pubsub.connect()
+            await pubsub.connection.send_command('CLIENT', 'ID')
+            redirect_id = await pubsub.connection.read_response()
+            await pubsub.subscribe(self.channel)
+
+            tracker = await REDIS_CONNECTION.connection_pool.get_connection('CLIENT')
+            try:
+                prefixes = [arg for prefix in self.config.client_cache_prefixes for arg in ('PREFIX', prefix)]
+                await tracker.send_command('CLIENT', 'TRACKING', 'ON', 'REDIRECT', redirect_id, 'BCAST', *prefixes)
+                await tracker.read_response()
+                await tracker.send_command('CLIENT', 'ID')
+                tracker_id = await tracker.read_response()
+                self.tracking = True
+
+                while True:
+                    message = await pubsub.get_message(timeout=self.config.health_check_interval_sec)
+                    if message is not None:
+                        self.invalidate(message['data'] or None)
+                        continue
+
+                    await tracker.send_command('CLIENT', 'ID')
+                    if await tracker.read_response() != tracker_id:
+                        raise RedisConnectionError('Redis client cache tracking connection was reset.')
+            finally:
+                await tracker.disconnect()
+                await REDIS_CONNECTION.connection_pool.release(tracker)
+
+
+CLIENT_CACHE = ClientCache(REDIS_CONFIG)
 
 
 class RedisSession:
     def __init__(self):
         self.connection = REDIS_CONNECTION
 
+    @observe_latency(REDIS_LATENCY, 'get_keys')
     async def get_keys(self, pattern: str = '*') -> List[str]:
-        return [key async for key in sleep_generator(await self.connection.keys(pattern=pattern))]
+        return [key async for key in self.scan_keys(pattern=pattern)]
+
+    async def scan_batches(
+            self,
+            pattern: str = '*',
+            batch_size: int = REDIS_CONFIG.scan_batch_size
+    ) -> AsyncIterator[List[str]]:
+        batch = []
+        async for key in self.connection.scan_iter(match=pattern, count=batch_size):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if len(batch) > 0:
+            yield batch
+
+    async def scan_keys(
+            self,
+            pattern: str = '*',
+            batch_size: int = REDIS_CONFIG.scan_batch_size
+    ) -> AsyncIterator[str]:
+        async for batch in self.scan_batches(pattern=pattern, batch_size=batch_size):
+            for key in batch:
+                yield key
 
+    @observe_latency(REDIS_LATENCY, 'get_value')
     async def get_value(self, key: str) -> str | None:
-        return await self.connection.get(key)
+        if not CLIENT_CACHE.is_cached(key):
+            return await self.connection.get(key)
+
+        value = CLIENT_CACHE.get(key)
+        if value is None:
+            generation = CLIENT_CACHE.generation
+            value = await self.connection.get(key)
+            CLIENT_CACHE.set(key, value, generation)
+        return value
+
+    @observe_latency(REDIS_LATENCY, 'get_values')
+    async def get_values(self, keys: List[str]) -> List[str | None]:
+        if len(keys) < 1:
+            return []
+        if REDIS_CONFIG.cluster:
+            return await self.connection.mget_nonatomic(keys)
+        return await self.connection.mget(keys)
+
+    @staticmethod
+    def expires_kwargs(
+            expires: int | datetime.timedelta | datetime.datetime | datetime.date = None
+    ) -> Dict[str, int | datetime.timedelta]:
+        if isinstance(expires, datetime.datetime):
+            expires = expires - get_now_with_delta()
+        if isinstance(expires, datetime.timedelta) or isinstance(expires, int):
+            return {'ex': expires}
+        return {}
 
+    @observe_latency(REDIS_LATENCY, 'set_item')
     async def set_item(
             self,
             key: str,
             value: bytes | str,
             expires: int | datetime.timedelta | datetime.datetime | datetime.date = None
     ):
-        await self.connection.set(key, value)
-        if isinstance(expires, datetime.timedelta) or isinstance(expires, int):
-            await self.connection.expire(key, expires)
-        if isinstance(expires, datetime.datetime):
-            await self.connection.expire(key, expires - get_now_with_delta())
+        await self.connection.set(key, value, **self.expires_kwargs(expires))
+
+    @observe_latency(REDIS_LATENCY, 'get_ttl')
+    async def get_ttl(self, key: str) -> int:
+        return await self.connection.ttl(key)
 
+    @observe_latency(REDIS_LATENCY, 'delete_item')
     async def delete_item(self, key: str):
         await self.connection.delete(key)
 
-    async def delete_values(self, pattern: str = '*'):
-        [
-            await self.connection.delete(key)
-            async for key in sleep_generator(await self.connection.keys(pattern=pattern))
-        ]
+    @observe_latency(REDIS_LATENCY, 'delete_items')
+    async def delete_items(self, keys: List[str]):
+        if len(keys) < 1:
+            return None
+        await self.connection.delete(*keys)
+
+    async def delete_values(
+            self,
+            pattern: str = '*',
+            batch_size: int = REDIS_CONFIG.scan_batch_size,
+            sleep_sec: float = REDIS_CONFIG.delete_sleep_sec
+    ) -> int:
+        deleted = 0
+        async for keys in self.scan_batches(pattern=pattern, batch_size=batch_size):
+            deleted += await self.connection.unlink(*keys)
+            await asyncio.sleep(sleep_sec)
+        return deleted
+
+    @observe_latency(REDIS_LATENCY, 'run_script')
+    async def run_script(self, script: AsyncScript, keys: List[str], args: List[str | int]) -> Any:
+        return await script(keys=keys, args=args, client=self.connection)
 
-    async def pop_value(self, key: str) -> str:
-        value = await self.get_value(key)
-        await self.delete_item(key)
-        return value
\ No newline at end of file
+    @observe_latency(REDIS_LATENCY, 'pop_value')
+    async def pop_value(self, key: str) -> str | None:
+        return await self.connection.getdel(key)
+
+    @asynccontextmanager
+    async def pipeline(
+            self,
+            transaction: bool = True,
+            results: List[Any] | None = None
+    ) -> AsyncIterator[Pipeline]:
+        async with self.connection.pipeline(transaction=transaction) as pipe:
+            yield pipe
+            started_at = time.perf_counter()
+            values = await pipe.execute()
+            REDIS_LATENCY.observe(time.perf_counter() - started_at, 'pipeline')
+        if results is not None:
+            results.extend(values)
+
+
+class BotRedisSession(RedisSession):
+    def __init__(self):
+        super().__init__()
+        self.connection = BOT_REDIS_CONNECTION
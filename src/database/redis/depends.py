@@ -2,9 +2,13 @@ from typing import Annotated
 
 import fastapi
 
-from src.database.redis.connection import RedisSession
+from src.database.redis.connection import RedisSession, BotRedisSession
 
 
 get_redis_session = Annotated[
     RedisSession, fastapi.Depends(RedisSession)
 ]
+
+get_bot_redis_session = Annotated[
+    BotRedisSession, fastapi.Depends(BotRedisSession)
+]
@@ -1,13 +1,16 @@
-from typing import TypeVar, Generic, Type, Dict, Any, List
+import functools
+from collections import Counter
+from typing import TypeVar, Generic, Type, Dict, Any, List, Iterable, Tuple, AsyncIterator
 from uuid import UUID
 
-from sqlalchemy import update, delete, select
+from sqlalchemy import update, delete, select, or_, Row, func
 from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config.postgres import POSTGRES_CONFIG
 from src.database.postgres.abstract_model import AbstractModel
 from src.domain.abc.dto import AbstractDTO
-from src.utils.time import get_now_with_delta
 
 
 ModelType = TypeVar('ModelType', bound=AbstractModel)
@@ -18,21 +21,102 @@ UpdateSchemeType = TypeVar('UpdateSchemeType', bound=AbstractDTO)
 ID = UUID | int | str
 
 
+class Projection[S: AbstractDTO]:
+    __slots__ = ('scheme', 'fields', 'columns')
+
+    def __init__(self, model: Type[AbstractModel], scheme: Type[S]):
+        self.scheme = scheme
+        self.fields = tuple(field for field in scheme.model_fields if hasattr(model, field))
+        self.columns = tuple(getattr(model, field) for field in self.fields)
+
+    def build(self, row: Row | Tuple[Any, ...]) -> S:
+        return self.scheme.model_construct(**dict(zip(self.fields, row)))
+
+
+@functools.cache
+def get_projection[S: AbstractDTO](model: Type[AbstractModel], scheme: Type[S]) -> Projection[S]:
+    return Projection(model, scheme)
+
+
 class AbstractDAO(Generic[ModelType, GetSchemeType, CreateSchemeType, UpdateSchemeType]):
     model: Type[ModelType] = AbstractModel
     get_scheme: Type[GetSchemeType] = GetSchemeType
     create_scheme: Type[CreateSchemeType] = CreateSchemeType
     update_scheme: Type[UpdateSchemeType] = UpdateSchemeType
+    unique_fields: Tuple[str, ...] = ()
+    projected: bool = False
+    soft_delete: bool = True
 
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    def active_where(self) -> List[Any]:
+        if self.soft_delete:
+            return [self.model.deleted_at.is_(None)]
+        return []
+
+    def get_entities(self) -> Tuple[Any, ...]:
+        if self.projected:
+            return get_projection(self.model, self.get_scheme).columns
+        return (self.model,)
+
+    def to_get_scheme(self, row: Row) -> GetSchemeType:
+        if self.projected:
+            return get_projection(self.model, self.get_scheme).build(row)
+        return self.get_scheme.model_validate(row[0])
+
+    async def invalidate(self, ids: Iterable[ID]):
+        pass
+
+    async def invalidate_on_commit(self, ids: Iterable[ID]):
+        ids = list(ids)
+        await self.invalidate(ids)
+        self.session.info.setdefault('after_commit', []).append(functools.partial(self.invalidate, ids))
+
     async def create(self, data: CreateSchemeType, **kwargs: Any) -> GetSchemeType:
-        query = insert(self.model).returning(self.model).values(**data.model_dump(exclude_none=True), **kwargs)
-        result = await self.session.scalar(query)
-        new_instance = self.get_scheme.model_validate(result)
+        values = {**data.model_dump(exclude_none=True), **kwargs}
+        query = insert(self.model).values(**values).returning(*self.get_entities())
+        result = (await self.session.execute(query)).one()
+        new_instance = self.to_get_scheme(result)
         return new_instance
 
+    async def get_conflict_fields(self, data: List[Dict[str, Any]]) -> Dict[int, str]:
+        values = {
+            field: {item[field] for item in data if item.get(field) is not None}
+            for field in self.unique_fields
+        }
+        fields = [field for field in self.unique_fields if len(values[field]) > 0]
+        if len(fields) < 1:
+            return {}
+
+        query = select(
+            *(getattr(self.model, field) for field in fields)
+        ).where(
+            or_(*(getattr(self.model, field).in_(values[field]) for field in fields))
+        )
+        rows = (await self.session.execute(query)).all()
+        existing = {field: {row[index] for row in rows} for index, field in enumerate(fields)}
+
+        conflicts = {}
+        for index, item in enumerate(data):
+            for field in fields:
+                if item.get(field) is not None and item[field] in existing[field]:
+                    conflicts[index] = field
+                    break
+        return conflicts
+
+    async def create_or_conflict(
+            self,
+            data: CreateSchemeType,
+            **kwargs: Any
+    ) -> Tuple[GetSchemeType | None, str | None]:
+        values = {**data.model_dump(exclude_none=True), **kwargs}
+        query = insert(self.model).values(**values).on_conflict_do_nothing().returning(*self.get_entities())
+        result = (await self.session.execute(query)).first()
+        if result is None:
+            return None, (await self.get_conflict_fields([values])).get(0)
+        return self.to_get_scheme(result), None
+
     async def update(self, data: UpdateSchemeType, **kwargs: Dict[str, Any]):
         query = update(
             self.model
@@ -42,6 +126,16 @@ class AbstractDAO(Generic[ModelType, GetSchemeType, CreateSchemeType, UpdateSche
             **data.model_dump(exclude_none=True, exclude={'id'}), **kwargs
         )
         await self.session.execute(query)
+        await self.invalidate_on_commit((data.id,))
+
+    async def update_or_conflict(self, data: UpdateSchemeType, **kwargs: Any) -> Tuple[bool, str | None]:
+        try:
+            async with self.session.begin_nested():
+                await self.update(data, **kwargs)
+        except IntegrityError:
+            values = {**data.model_dump(exclude_none=True, exclude={'id'}), **kwargs}
+            return False, (await self.get_conflict_fields([values])).get(0)
+        return True, None
 
     async def create_list(self, data: List[Dict[str, Any]], with_returning: bool = True) -> List[GetSchemeType] | None:
         if len(data) < 1:
@@ -50,19 +144,42 @@ class AbstractDAO(Generic[ModelType, GetSchemeType, CreateSchemeType, UpdateSche
             await self.session.execute(insert(self.model), data)
             return []
 
-        query = insert(self.model).returning(self.model, sort_by_parameter_order=True)
-        result = await self.session.scalars(query, data)
-        return [self.get_scheme.model_validate(instance) for instance in result]
+        query = insert(self.model).returning(*self.get_entities(), sort_by_parameter_order=True)
+        result = await self.session.execute(query, data)
+        return [self.to_get_scheme(row) for row in result]
+
+    async def create_list_or_conflict(
+            self,
+            data: List[Dict[str, Any]]
+    ) -> Tuple[List[GetSchemeType], Dict[int, str | None]]:
+        if len(data) < 1:
+            return [], {}
+
+        query = insert(self.model).on_conflict_do_nothing().returning(*self.get_entities())
+        created = [self.to_get_scheme(row) for row in await self.session.execute(query, data)]
+
+        created_keys = Counter(tuple(getattr(instance, field) for field in self.unique_fields) for instance in created)
+        skipped = []
+        for index, item in enumerate(data):
+            key = tuple(item.get(field) for field in self.unique_fields)
+            if created_keys[key] > 0:
+                created_keys[key] -= 1
+            else:
+                skipped.append(index)
+        skipped_conflicts = await self.get_conflict_fields([data[index] for index in skipped])
+        return created, {index: skipped_conflicts.get(position) for position, index in enumerate(skipped)}
 
     async def update_list(self, data: List[Dict[str, Any]]):
         if len(data) < 1:
             return None
         await self.session.execute(update(self.model), data)
+        await self.invalidate_on_commit(item['id'] for item in data)
 
     async def delete_list(self, ids: List[ID]):
         if len(ids) < 1:
             return None
         await self.session.execute(delete(self.model).where(self.model.id.in_(ids)))
+        await self.invalidate_on_commit(ids)
 
     async def deactivate(self, instance_id: ID):
         query = update(
@@ -70,24 +187,66 @@ class AbstractDAO(Generic[ModelType, GetSchemeType, CreateSchemeType, UpdateSche
         ).where(
             self.model.id == instance_id
         ).values(
-            {'deleted_at': get_now_with_delta(is_date=True).timestamp()}
+            {'deleted_at': func.current_timestamp()}
         )
 
         await self.session.execute(query)
+        await self.invalidate_on_commit((instance_id,))
+
+    def filter_where(self, filters: Dict[str, Any]) -> List[Any]:
+        return [*self.active_where(), *(getattr(self.model, field) == value for field, value in filters.items())]
 
     async def get_list(self) -> List[GetSchemeType]:
-        result = await self.session.scalars(select(self.model))
-        return [self.get_scheme.model_validate(item) for item in result]
+        result = await self.session.execute(select(*self.get_entities()).where(*self.active_where()))
+        return [self.to_get_scheme(row) for row in result]
+
+    async def get_page(
+            self,
+            after: ID | None = None,
+            limit: int = POSTGRES_CONFIG.page_size,
+            **filters: Any
+    ) -> List[GetSchemeType]:
+        query = select(*self.get_entities()).where(*self.filter_where(filters)).order_by(self.model.id).limit(limit)
+        if after is not None:
+            query = query.where(self.model.id > after)
+        result = await self.session.execute(query)
+        return [self.to_get_scheme(row) for row in result]
+
+    async def stream(
+            self,
+            batch_size: int = POSTGRES_CONFIG.stream_batch_size,
+            **filters: Any
+    ) -> AsyncIterator[List[GetSchemeType]]:
+        query = select(
+            *self.get_entities()
+        ).where(
+            *self.filter_where(filters)
+        ).order_by(
+            self.model.id
+        ).execution_options(
+            yield_per=batch_size
+        )
+        result = await self.session.stream(query)
+        async for partition in result.partitions():
+            yield [self.to_get_scheme(row) for row in partition]
 
     async def get_dto_by_id(self, instance_id: ID) -> GetSchemeType | None:
+        if self.projected:
+            query = select(*self.get_entities()).where(self.model.id == instance_id, *self.active_where()).limit(1)
+            result = (await self.session.execute(query)).first()
+            if result is not None:
+                return self.to_get_scheme(result)
+            return None
+
         result = await self.session.get(self.model, instance_id)
-        if result is not None:
+        if result is not None and (not self.soft_delete or result.deleted_at is None):
             return self.get_scheme.model_validate(result)
 
     async def get_model_by_id(self, instance_id: ID) -> ModelType | None:
         query = select(
             self.model
         ).where(
-            self.model.id == instance_id
+            self.model.id == instance_id,
+            *self.active_where()
         ).limit(1)
         return (await self.session.execute(query)).scalar_one_or_none()
\ No newline at end of file
@@ -1,50 +1,256 @@
+import time
+from typing import AsyncIterator, Dict, Tuple
 from uuid import UUID, uuid4
 
 from src.config.auth import AUTH_CONFIG
-from src.database.redis.connection import RedisSession
+from src.config.redis import REDIS_CONFIG
+from src.database.redis.connection import REDIS_CONNECTION, RedisSession
 from src.domain.authentication.dto import RefreshTokenDTO
 from src.domain.authentication.exception import AuthenticationExceptions
 from src.domain.user.dto import RoleEnum
 
 
+ISSUE_FAMILY_SCRIPT = REDIS_CONNECTION.register_script('''
+if (redis.call('GET', KEYS[1]) or '') ~= ARGV[5] then
+    return 0
+end
+if KEYS[3] then
+    redis.call('DEL', KEYS[3])
+end
+redis.call('HSET', KEYS[2], 'cur', ARGV[2], 'role', ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[4])
+return 1
+''')
+
+MIGRATE_TOKEN_SCRIPT = REDIS_CONNECTION.register_script('''
+local current = redis.call('GET', KEYS[2])
+if current and current ~= ARGV[1] then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'cur', ARGV[1], 'role', ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('SET', KEYS[2], ARGV[1], 'EX', ARGV[3])
+return 1
+''')
+
+ROTATE_FAMILY_SCRIPT = REDIS_CONNECTION.register_script('''
+local family = redis.call('HMGET', KEYS[1], 'cur', 'role', 'prev', 'prev_until')
+local current, role = family[1], family[2]
+if not current then
+    return false
+end
+if current ~= ARGV[1] then
+    if family[3] == ARGV[1] and tonumber(ARGV[5]) < tonumber(family[4]) then
+        return {role, current}
+    end
+    redis.call('DEL', KEYS[1])
+    if redis.call('GET', KEYS[2]) == ARGV[4] then
+        redis.call('DEL', KEYS[2])
+    end
+    return 0
+end
+redis.call('HSET', KEYS[1], 'cur', ARGV[2], 'prev', ARGV[1], 'prev_until', tonumber(ARGV[5]) + tonumber(ARGV[6]))
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+if redis.call('GET', KEYS[2]) == ARGV[4] then
+    redis.call('EXPIRE', KEYS[2], ARGV[3])
+end
+return {role, ARGV[2]}
+''')
+
+REVOKE_FAMILY_SCRIPT = REDIS_CONNECTION.register_script('''
+local family = redis.call('HMGET', KEYS[1], 'cur', 'prev', 'prev_until')
+redis.call('DEL', KEYS[1])
+if redis.call('GET', KEYS[2]) == ARGV[1] then
+    redis.call('DEL', KEYS[2])
+end
+if not family[1] or family[1] == ARGV[2] then
+    return 1
+end
+if family[2] == ARGV[2] and tonumber(ARGV[3]) < tonumber(family[3]) then
+    return 1
+end
+return 0
+''')
+
+RATE_LIMIT_SCRIPT = REDIS_CONNECTION.register_script('''
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+for index, key in ipairs(KEYS) do
+    redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+    if redis.call('ZCARD', key) >= tonumber(ARGV[3 + index]) then
+        return 0
+    end
+end
+for _, key in ipairs(KEYS) do
+    redis.call('ZADD', key, now, ARGV[3])
+    redis.call('PEXPIRE', key, window)
+end
+return 1
+''')
+
+
 class AuthenticationDAO:
+    user_prefix: str = 'refresh_user'
+    family_prefix: str = 'refresh_family'
+    legacy_prefix: str = 'refresh_legacy'
+    legacy_pattern: str = '*,*'
+    migrated_key: str = 'refresh_migration:done'
+    migration_lock_key: str = 'refresh_migration:lock'
+    migration_lock_sec: int = 60 * 10
+
     def __init__(self, redis_session: RedisSession):
         self.redis_session = redis_session
 
+    @classmethod
+    def user_key(cls, user_id: str | UUID) -> str:
+        return f'{cls.user_prefix}:{{{str(user_id)}}}'
+
+    @classmethod
+    def family_key(cls, user_id: str | UUID, family: str) -> str:
+        return f'{cls.family_prefix}:{{{str(user_id)}}}:{family}'
+
+    @classmethod
+    def legacy_key(cls, refresh_token: str) -> str:
+        return f'{cls.legacy_prefix}:{refresh_token}'
+
+    @staticmethod
+    def parse_family_token(refresh_token: str | UUID) -> Tuple[str, str, str] | None:
+        parts = str(refresh_token).split('.')
+        if len(parts) != 3:
+            return None
+        user_id, family, secret = parts
+        return user_id, family, secret
+
+    async def resolve_refresh_token(self, refresh_token: str | UUID) -> Tuple[str, str, str] | None:
+        refresh_token = str(refresh_token)
+        if '.' in refresh_token:
+            return self.parse_family_token(refresh_token)
+
+        user_id = await self.redis_session.get_value(self.legacy_key(refresh_token))
+        if user_id is None:
+            return None
+        return user_id, refresh_token, refresh_token
+
     async def create_refresh_token(
             self,
             user_id: str | UUID,
             role: str | RoleEnum
     ) -> str:
-        refresh_token = str(uuid4())
+        family, secret = uuid4().hex, uuid4().hex
         if isinstance(role, RoleEnum):
             role = str(role.value)
-        await self.redis_session.set_item(
-            f'{refresh_token},{str(user_id)}',
-            role,
-            AUTH_CONFIG.refresh_exp_sec
+
+        user_key = self.user_key(user_id)
+        while True:
+            previous = await self.redis_session.get_value(user_key)
+            keys = [user_key, self.family_key(user_id, family)]
+            if previous is not None:
+                keys.append(self.family_key(user_id, previous))
+            issued = await self.redis_session.run_script(
+                ISSUE_FAMILY_SCRIPT, keys, [family, secret, role, AUTH_CONFIG.refresh_exp_sec, previous or '']
+            )
+            if issued == 1:
+                return f'{str(user_id)}.{family}.{secret}'
+
+    async def rotate_refresh_token(self, refresh_token: str | UUID) -> Tuple[str | None, RefreshTokenDTO | None]:
+        parts = await self.resolve_refresh_token(refresh_token)
+        if parts is None:
+            return None, None
+
+        user_id, family, secret = parts
+        result = await self.redis_session.run_script(
+            ROTATE_FAMILY_SCRIPT,
+            [self.family_key(user_id, family), self.user_key(user_id)],
+            [
+                secret, uuid4().hex, AUTH_CONFIG.refresh_exp_sec, family,
+                time.time_ns() // 1_000_000, AUTH_CONFIG.refresh_reuse_grace_sec * 1000,
+            ]
         )
-        return refresh_token
+        if result is None:
+            return None, None
+        if result == 0:
+            raise AuthenticationExceptions.RefreshReused
+        role, new_secret = result
+        return f'{user_id}.{family}.{new_secret}', RefreshTokenDTO(user_id=user_id, role=role)
 
-    async def pop_refresh_token(
-            self,
-            *,
-            refresh_token: str | UUID | None = None,
-            user_id: str | UUID | None = None
-    ) -> RefreshTokenDTO | None:
-        pattern = '*'
-        if refresh_token is None and user_id is None:
-            raise AuthenticationExceptions.RefreshNotFound
-        elif user_id is not None:
-            pattern = f'*,{str(user_id)}'
-        elif refresh_token is not None:
-            pattern = f'{str(refresh_token)},*'
-
-        tokens_keys = await self.redis_session.get_keys(pattern=pattern)
-        if len(tokens_keys) == 0:
+    async def revoke_refresh_token(self, refresh_token: str | UUID):
+        parts = await self.resolve_refresh_token(refresh_token)
+        if parts is None:
             return None
-        token_key = tokens_keys[0]
 
-        role = await self.redis_session.get_value(token_key)
-        await self.redis_session.delete_item(token_key)
-        return RefreshTokenDTO.fabric(token_key, role)
\ No newline at end of file
+        user_id, family, secret = parts
+        revoked = await self.redis_session.run_script(
+            REVOKE_FAMILY_SCRIPT,
+            [self.family_key(user_id, family), self.user_key(user_id)],
+            [family, secret, time.time_ns() // 1_000_000]
+        )
+        if revoked == 0:
+            raise AuthenticationExceptions.RefreshReused
+
+    async def is_migrated(self) -> bool:
+        return await self.redis_session.get_value(self.migrated_key) is not None
+
+    async def lock_migration(self) -> bool:
+        return bool(await self.redis_session.connection.set(
+            self.migration_lock_key, 1, nx=True, ex=self.migration_lock_sec
+        ))
+
+    async def unlock_migration(self):
+        await self.redis_session.delete_item(self.migration_lock_key)
+
+    async def count_legacy_tokens(self) -> int:
+        legacy = 0
+        async for _ in self.redis_session.scan_keys(pattern=self.legacy_pattern):
+            legacy += 1
+        return legacy
+
+    async def migrate_legacy_tokens(self) -> AsyncIterator[str]:
+        async for legacy_key in self.redis_session.scan_keys(pattern=self.legacy_pattern):
+            refresh_token, user_id = legacy_key.split(',', 1)
+            role = await self.redis_session.get_value(legacy_key)
+            ttl = await self.redis_session.get_ttl(legacy_key)
+            if role is None or ttl == -2:
+                continue
+
+            expires = ttl if ttl > 0 else AUTH_CONFIG.refresh_exp_sec
+            migrated = await self.redis_session.run_script(
+                MIGRATE_TOKEN_SCRIPT,
+                [self.family_key(user_id, refresh_token), self.user_key(user_id)],
+                [refresh_token, role, expires]
+            )
+            if migrated == 1:
+                await self.redis_session.set_item(self.legacy_key(refresh_token), user_id, expires)
+            await self.redis_session.delete_item(legacy_key)
+            yield legacy_key
+        await self.redis_session.set_item(self.migrated_key, 1)
+
+
+class RateLimitDAO:
+    prefix: str = 'rate'
+
+    def __init__(self, redis_session: RedisSession):
+        self.redis_session = redis_session
+
+    @classmethod
+    def limit_key(cls, scope: str, value: str) -> str:
+        return f'{cls.prefix}:{scope}:{value}'
+
+    async def hit(self, limits: Dict[str, int], window_sec: int) -> bool:
+        now_ms = time.time_ns() // 1_000_000
+        window_ms = window_sec * 1000
+        member = f'{now_ms}:{uuid4().hex[:8]}'
+
+        args = [now_ms, window_ms, member]
+        if not REDIS_CONFIG.cluster:
+            return await self.redis_session.run_script(RATE_LIMIT_SCRIPT, list(limits), [*args, *limits.values()]) == 1
+
+        admitted = []
+        for key, limit in limits.items():
+            if await self.redis_session.run_script(RATE_LIMIT_SCRIPT, [key], [*args, limit]) != 1:
+                async with self.redis_session.pipeline(transaction=False) as pipe:
+                    for admitted_key in admitted:
+                        pipe.zrem(admitted_key, member)
+                return False
+            admitted.append(key)
+        return True
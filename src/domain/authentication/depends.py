@@ -2,13 +2,22 @@ from typing import Annotated
 
 import fastapi
 
-from src.domain.authentication.service import validate_user_credentials, delete_tokens, update_tokens
-from src.domain.user.dto import UserSecureCredentialsDTO
+from src.domain.authentication.service import validate_user_credentials, delete_tokens, update_tokens, \
+    validate_telegram_user, link_telegram_user
+from src.domain.user.dto import UserSecureCredentialsDTO, UserRoleDTO
 
 validate_user_credentials_depends = Annotated[
     UserSecureCredentialsDTO, fastapi.Depends(validate_user_credentials)
 ]
 
+validate_telegram_user_depends = Annotated[
+    UserRoleDTO, fastapi.Depends(validate_telegram_user)
+]
+
+link_telegram_user_depends = Annotated[
+    UserRoleDTO, fastapi.Depends(link_telegram_user)
+]
+
 delete_tokens_depends = Annotated[
     None, fastapi.Depends(delete_tokens)
 ]
@@ -3,7 +3,7 @@ from uuid import UUID
 
 from src.domain.user.dto import RoleEnum
 from src.domain.abc.dto import CustomSecretStr, AbstractDTO, PhoneStr
-from src.utils.time import get_now_with_delta
+from src.utils.time import get_timestamp
 
 
 class UserSignInDTO(AbstractDTO):
@@ -11,16 +11,25 @@ class UserSignInDTO(AbstractDTO):
     password: CustomSecretStr
 
 
+class TelegramSignInDTO(AbstractDTO):
+    tg_id: int
+
+
+class TelegramLinkDTO(UserSignInDTO):
+    tg_id: int
+
+
 class AccessTokenDTO(AbstractDTO):
     sub: UUID
     role: RoleEnum
     exp: int
+    perm: int | None = None
 
     @classmethod
     def access_fabric(cls, id: UUID, role: RoleEnum, exp: int) -> Self:
         return cls(
             sub=id,
-            exp=int(get_now_with_delta(seconds=exp).timestamp()),
+            exp=get_timestamp(exp),
             role=role
         )
 
@@ -1,5 +1,7 @@
 from fastapi import HTTPException, status
 
+from src.config.auth import AUTH_CONFIG
+
 
 class AuthenticationExceptions:
     RefreshNotFound = HTTPException(
@@ -10,6 +12,10 @@ class AuthenticationExceptions:
         status_code=status.HTTP_410_GONE, detail='Refresh token was expired.'
     )
 
+    RefreshReused = HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN, detail='Refresh token was already used, the session was revoked.'
+    )
+
     AccessNotFound = HTTPException(
         status_code=status.HTTP_404_NOT_FOUND, detail='Access token not found.'
     )
@@ -26,11 +32,42 @@ class AuthenticationExceptions:
         status_code=status.HTTP_409_CONFLICT, detail='Telegram already used another user.'
     )
 
+    ConflictUser = HTTPException(
+        status_code=status.HTTP_409_CONFLICT, detail='User conflicts with an existing user.'
+    )
+
     InvalidCredentials = HTTPException(
         status_code=status.HTTP_403_FORBIDDEN, detail='Invalid credentials.'
     )
 
+    TelegramNotLinked = HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND, detail='Telegram is not linked to any user.'
+    )
+
+    InvalidBot = HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN, detail='Invalid bot token.'
+    )
+
     InvalidRole = HTTPException(
         status_code=status.HTTP_400_BAD_REQUEST, detail="The user role doesn't allow you to get this."
     )
-    
\ No newline at end of file
+
+    InvalidImportEncoding = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST, detail='Import file must be UTF-8 encoded.'
+    )
+
+    TooManyAttempts = HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail='Too many attempts, try again later.',
+        headers={'Retry-After': str(AUTH_CONFIG.rate_limit_window_sec)}
+    )
+
+    ServerBusy = HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail='Server is busy, try again later.',
+        headers={'Retry-After': '1'}
+    )
+
+
+CONFLICT_EXCEPTIONS = {
+    'phone': AuthenticationExceptions.ConflictPhone,
+    'tg_id': AuthenticationExceptions.ConflictTelegram,
+}
@@ -0,0 +1,58 @@
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+from jwt.algorithms import get_default_algorithms
+
+from src.config.auth import AUTH_CONFIG, AuthConfig
+
+
+class SigningKeys:
+    __slots__ = ('config', 'active_kid', 'private_key', 'public_keys', 'jwks', 'jwks_body')
+
+    def __init__(self, config: AuthConfig):
+        self.config = config
+        self.active_kid: str | None = None
+        self.private_key: Any = None
+        self.public_keys: Dict[str, Any] = {}
+        self.jwks: Dict[str, list] = {'keys': []}
+        self.jwks_body: bytes = b'{"keys":[]}'
+
+    @property
+    def is_asymmetric(self) -> bool:
+        return not self.config.algorithm.startswith('HS')
+
+    def load(self):
+        if not self.is_asymmetric:
+            return None
+
+        algorithms = get_default_algorithms()
+        if self.config.algorithm not in algorithms:
+            raise RuntimeError(f"Algorithm {self.config.algorithm} requires the 'cryptography' package.")
+        if self.config.keys_dir is None:
+            raise RuntimeError(f'Algorithm {self.config.algorithm} requires AUTH_KEYS_DIR to be set.')
+        algorithm = algorithms[self.config.algorithm]
+
+        private_keys, public_keys, jwks = {}, {}, []
+        for path in sorted(Path(self.config.keys_dir).glob('*.pem')):
+            kid = path.stem
+            key = algorithm.prepare_key(path.read_bytes())
+            if hasattr(key, 'private_bytes'):
+                private_keys[kid] = key
+                key = key.public_key()
+            public_keys[kid] = key
+            jwks.append({**json.loads(algorithm.to_jwk(key)), 'kid': kid, 'use': 'sig', 'alg': self.config.algorithm})
+
+        active_kid = self.config.active_kid or max(private_keys, default=None)
+        if active_kid not in private_keys:
+            raise RuntimeError(f'Private key {active_kid} not found in {self.config.keys_dir}.')
+
+        self.active_kid = active_kid
+        self.private_key = private_keys[active_kid]
+        self.public_keys = public_keys
+        self.jwks = {'keys': jwks}
+        self.jwks_body = json.dumps(self.jwks, separators=(',', ':')).encode()
+
+
+SIGNING_KEYS = SigningKeys(AUTH_CONFIG)
+SIGNING_KEYS.load()
@@ -1,36 +1,128 @@
 import hashlib
-from typing import List, Annotated
+import hmac
+import logging
+import time
+from typing import List, Annotated, Tuple
 from uuid import uuid4, UUID
 
 from fastapi import Body, Response, Security, HTTPException
-from fastapi.security import HTTPBearer, APIKeyCookie, HTTPAuthorizationCredentials
-from jwt import PyJWT, InvalidTokenError
+from fastapi.security import HTTPBearer, APIKeyCookie, HTTPAuthorizationCredentials, APIKeyHeader
+from jwt import PyJWT, InvalidTokenError, get_unverified_header
 from pydantic import SecretStr
 from starlette.requests import Request
 
 from src.config.auth import AUTH_CONFIG
+from src.database.redis.connection import RedisSession
 from src.database.redis.depends import get_redis_session
+from src.database.postgres.connection import Session
 from src.database.postgres.depends import get_session
-from src.domain.authentication.dal import AuthenticationDAO
-from src.domain.authentication.dto import UserSignInDTO, AccessTokenDTO, RefreshTokenDTO
-from src.domain.authentication.exception import AuthenticationExceptions
+from src.domain.authentication.dal import AuthenticationDAO, RateLimitDAO
+from src.domain.authentication.dto import UserSignInDTO, AccessTokenDTO, RefreshTokenDTO, TelegramSignInDTO, \
+    TelegramLinkDTO
+from src.domain.authentication.exception import AuthenticationExceptions, CONFLICT_EXCEPTIONS
+from src.domain.authentication.keys import SIGNING_KEYS
 from src.domain.user.dal import UserDAO
-from src.domain.user.dto import UserSecureCredentialsDTO, RoleEnum
-from src.utils.time import get_now_with_delta
+from src.domain.user.cache import TELEGRAM_CACHE
+from src.domain.user.dto import UserSecureCredentialsDTO, RoleEnum, UserUpdateDTO, UserRoleDTO
+from src.domain.user.permission import PERMISSION_MODEL, PermissionEnum
+from src.utils.cache import TTLCache
+from src.utils.executor import BoundedProcessExecutor, ConcurrencyLimiter
+from src.utils.metrics import REGISTRY, observe_latency
+from src.utils.time import get_timestamp
+
+logger = logging.getLogger(__name__)
+
+HASH_EXECUTOR = BoundedProcessExecutor(
+    AUTH_CONFIG.get_hash_workers(), AUTH_CONFIG.hash_max_in_flight, AUTH_CONFIG.hash_start_method
+)
+HASHING_LIMITER = ConcurrencyLimiter(AUTH_CONFIG.hash_concurrency_limit)
+ACCESS_CACHE = TTLCache[bytes, AccessTokenDTO](AUTH_CONFIG.access_cache_size)
+
+HASH_LATENCY = REGISTRY.histogram('password_hash_seconds', 'Latency of password hashing.', ('operation',))
+JWT_LATENCY = REGISTRY.histogram('jwt_seconds', 'Latency of JWT encoding and verification.', ('operation',))
+REGISTRY.gauge(
+    'password_hash_queue', 'Password hashing executor queue of this worker process.', ('state',),
+    lambda: {
+        ('waiting',): HASH_EXECUTOR.waiting,
+        ('in_flight',): HASH_EXECUTOR.in_flight,
+        ('requests',): HASHING_LIMITER.active,
+    }
+)
+REGISTRY.gauge(
+    'access_token_cache', 'Verified access token cache.', ('statistic',),
+    lambda: {('hits',): ACCESS_CACHE.hits, ('misses',): ACCESS_CACHE.misses, ('size',): len(ACCESS_CACHE)}
+)
 
 
 class Hasher:
+    algorithm: str = 'pbkdf2_sha256'
+
     @staticmethod
-    def get_password_hash(password: str | SecretStr) -> str:
+    def get_password_hash(
+            password: str | SecretStr,
+            iterations: int = AUTH_CONFIG.password_hash_iterations
+    ) -> str:
         if isinstance(password, SecretStr):
             password = password.get_secret_value()
         salt = uuid4().hex
-        return f'{hashlib.sha256(salt.encode() + password.encode()).hexdigest()}:{salt}'
+        digest = hashlib.pbkdf2_hmac('sha256', password.encode(), salt.encode(), iterations).hex()
+        return f'{Hasher.algorithm}${iterations}${salt}${digest}'
 
     @staticmethod
     def verify_password(plain_password: str, hashed_password_with_salt: str) -> bool:
-        hashed_password, salt = hashed_password_with_salt.split(':')
-        return hashed_password == hashlib.sha256(salt.encode() + plain_password.encode()).hexdigest()
+        try:
+            if '$' not in hashed_password_with_salt:
+                hashed_password, salt = hashed_password_with_salt.split(':')
+                return hmac.compare_digest(
+                    hashed_password, hashlib.sha256(salt.encode() + plain_password.encode()).hexdigest()
+                )
+
+            algorithm, iterations, salt, digest = hashed_password_with_salt.split('$')
+            if algorithm != Hasher.algorithm or int(iterations) < 1:
+                return False
+            return hmac.compare_digest(
+                digest, hashlib.pbkdf2_hmac('sha256', plain_password.encode(), salt.encode(), int(iterations)).hex()
+            )
+        except (ValueError, TypeError):
+            return False
+
+    @staticmethod
+    def needs_rehash(hashed_password_with_salt: str) -> bool:
+        parts = hashed_password_with_salt.split('$')
+        if len(parts) != 4 or parts[0] != Hasher.algorithm or not parts[1].isdigit():
+            return True
+        return int(parts[1]) != AUTH_CONFIG.password_hash_iterations
+
+    @classmethod
+    @observe_latency(HASH_LATENCY, 'hash')
+    async def async_get_password_hash(cls, password: str | SecretStr) -> str:
+        if isinstance(password, SecretStr):
+            password = password.get_secret_value()
+        return await HASH_EXECUTOR.run(cls.get_password_hash, password, AUTH_CONFIG.password_hash_iterations)
+
+    @classmethod
+    @observe_latency(HASH_LATENCY, 'verify')
+    async def async_verify_password(cls, plain_password: str | SecretStr, hashed_password_with_salt: str) -> bool:
+        if isinstance(plain_password, SecretStr):
+            plain_password = plain_password.get_secret_value()
+        return await HASH_EXECUTOR.run(cls.verify_password, plain_password, hashed_password_with_salt)
+
+
+class CookieTemplate:
+    __slots__ = ('prefix', 'suffix')
+
+    def __init__(self, key: str, max_age: int):
+        response = Response()
+        response.set_cookie(key, 'value', max_age, **AUTH_CONFIG.cookies_kwargs())
+        self.prefix = f'{key}='.encode()
+        self.suffix = response.raw_headers[-1][1][len(self.prefix) + len('value'):]
+
+    def set(self, response: Response, value: str):
+        response.raw_headers.append((b'set-cookie', self.prefix + value.encode() + self.suffix))
+
+
+REFRESH_COOKIE = CookieTemplate(AUTH_CONFIG.refresh_key, AUTH_CONFIG.refresh_exp_sec)
+ACCESS_COOKIE = CookieTemplate(AUTH_CONFIG.access_key, AUTH_CONFIG.access_exp_sec)
 
 
 class JWT:
@@ -45,15 +137,40 @@ class JWT:
 
     @classmethod
     def encode(cls, claims: dict[str, str | int]) -> str:
-        return cls.jwt.encode(claims, AUTH_CONFIG.secret, algorithm=AUTH_CONFIG.algorithm)
+        started_at = time.perf_counter()
+        if not SIGNING_KEYS.is_asymmetric:
+            token = cls.jwt.encode(claims, AUTH_CONFIG.secret, algorithm=AUTH_CONFIG.algorithm)
+        else:
+            token = cls.jwt.encode(
+                claims, SIGNING_KEYS.private_key, algorithm=AUTH_CONFIG.algorithm,
+                headers={'kid': SIGNING_KEYS.active_kid}
+            )
+        JWT_LATENCY.observe(time.perf_counter() - started_at, 'encode')
+        return token
 
     @classmethod
     def decode(cls, token: str) -> dict[str, str | int]:
         try:
-            return cls.jwt.decode(token, AUTH_CONFIG.secret, algorithms=[AUTH_CONFIG.algorithm])
+            key = AUTH_CONFIG.secret
+            if SIGNING_KEYS.is_asymmetric:
+                key = SIGNING_KEYS.public_keys.get(get_unverified_header(token).get('kid'))
+                if key is None:
+                    raise AuthenticationExceptions.InvalidCredentials
+            return cls.jwt.decode(token, key, algorithms=[AUTH_CONFIG.algorithm])
         except InvalidTokenError:
             raise AuthenticationExceptions.InvalidCredentials
 
+    @classmethod
+    def decode_access(cls, token: str) -> AccessTokenDTO:
+        token_digest = hashlib.sha256(token.encode()).digest()
+        access_payload = ACCESS_CACHE.get(token_digest)
+        if access_payload is None:
+            started_at = time.perf_counter()
+            access_payload = AccessTokenDTO.model_validate(cls.decode(token))
+            JWT_LATENCY.observe(time.perf_counter() - started_at, 'decode')
+            ACCESS_CACHE.set(token_digest, access_payload, access_payload.exp - get_timestamp())
+        return access_payload
+
 
 refresh_bearer_depends = Annotated[
     HTTPAuthorizationCredentials | None,
@@ -93,9 +210,19 @@ access_cookies_depends = Annotated[
     )
 ]
 
+bot_header_depends = Annotated[
+    str | None,
+    Security(
+        APIKeyHeader(
+            name=AUTH_CONFIG.bot_header, description='Set bot secret to header.', auto_error=False,
+        )
+    )
+]
+
 
 def check_access(
-        allowed_roles: List[RoleEnum],
+        roles_mask: int,
+        permissions_mask: int,
         bearer_token: access_bearer_depends,
         cookies_token: access_cookies_depends
 ) -> AccessTokenDTO:
@@ -106,22 +233,31 @@ def check_access(
     else:
         raise AuthenticationExceptions.AccessNotFound
 
-    token_payload = AccessTokenDTO.model_validate(JWT.decode(token))
+    token_payload = JWT.decode_access(token)
 
-    if token_payload.exp < int(get_now_with_delta().timestamp()):
+    if token_payload.exp < get_timestamp():
         raise AuthenticationExceptions.AccessExpires
 
-    if token_payload.role not in allowed_roles:
+    if not has_access(token_payload, roles_mask, permissions_mask):
         raise AuthenticationExceptions.InvalidRole
 
     return token_payload
 
 
+def has_access(token_payload: AccessTokenDTO, roles_mask: int, permissions_mask: int) -> bool:
+    if not PERMISSION_MODEL.role_bits.get(token_payload.role, 0) & roles_mask:
+        return False
+    token_mask = token_payload.perm
+    if token_mask is None:
+        token_mask = PERMISSION_MODEL.role_masks.get(token_payload.role, 0)
+    return token_mask & permissions_mask == permissions_mask
+
+
 async def check_refresh(
         refresh_bearer_token: refresh_bearer_depends,
         refresh_cookies_token: refresh_cookies_depends,
         redis_session: get_redis_session
-) -> RefreshTokenDTO:
+) -> Tuple[str, RefreshTokenDTO]:
     if refresh_bearer_token is not None:
         refresh_token = refresh_bearer_token.credentials
     elif refresh_cookies_token is not None:
@@ -129,17 +265,25 @@ async def check_refresh(
     else:
         raise AuthenticationExceptions.RefreshNotFound
 
-    refresh_payload = await AuthenticationDAO(redis_session).pop_refresh_token(refresh_token=refresh_token)
+    try:
+        new_refresh_token, refresh_payload = await AuthenticationDAO(redis_session).rotate_refresh_token(refresh_token)
+    except HTTPException as e:
+        if e is AuthenticationExceptions.RefreshReused:
+            logger.warning('Refresh token reuse detected, token family revoked.')
+        raise e
     if refresh_payload is None:
         raise AuthenticationExceptions.InvalidCredentials
-    return refresh_payload
+    return new_refresh_token, refresh_payload
 
 
 class RoleFilter:
-    __slots__ = ('allowed_roles',)
+    __slots__ = ('roles_mask', 'permissions_mask')
 
-    def __init__(self, allowed_roles: List[RoleEnum]):
-        self.allowed_roles = allowed_roles
+    def __init__(self, allowed_roles: List[RoleEnum] | None = None, permissions: List[PermissionEnum] = ()):
+        if allowed_roles is None:
+            allowed_roles = list(RoleEnum)
+        self.roles_mask = PERMISSION_MODEL.roles_mask(allowed_roles)
+        self.permissions_mask = PERMISSION_MODEL.permissions_mask(permissions)
 
     async def __call__(
             self,
@@ -151,36 +295,118 @@ class RoleFilter:
             redis_session: get_redis_session
     ) -> AccessTokenDTO:
         try:
-            access_payload = check_access(self.allowed_roles, access_bearer_token, access_cookies_token)
+            access_payload = check_access(
+                self.roles_mask, self.permissions_mask, access_bearer_token, access_cookies_token
+            )
             return access_payload
         except HTTPException as e:
-            if e in (AuthenticationExceptions.AccessNotFound, AuthenticationExceptions.AccessExpires):
-                access_payload = await update_tokens(
-                    response, refresh_bearer_token, refresh_cookies_token, redis_session
-                )
-                return access_payload
+            if e not in (AuthenticationExceptions.AccessNotFound, AuthenticationExceptions.AccessExpires):
+                raise e
+
+        access_payload = await update_tokens(
+            response, refresh_bearer_token, refresh_cookies_token, redis_session
+        )
+        if not has_access(access_payload, self.roles_mask, self.permissions_mask):
+            raise AuthenticationExceptions.InvalidRole
+        return access_payload
+
+
+async def acquire_hashing_slot():
+    if not HASHING_LIMITER.try_acquire():
+        raise AuthenticationExceptions.ServerBusy
+    try:
+        yield
+    finally:
+        HASHING_LIMITER.release()
+
+
+async def check_rate_limit(request: Request, redis_session: RedisSession, phone: str):
+    limits = {RateLimitDAO.limit_key('phone', phone): AUTH_CONFIG.rate_limit_per_phone}
+    if request.client is not None:
+        limits[RateLimitDAO.limit_key('ip', request.client.host)] = AUTH_CONFIG.rate_limit_per_ip
+    if not await RateLimitDAO(redis_session).hit(limits, AUTH_CONFIG.rate_limit_window_sec):
+        raise AuthenticationExceptions.TooManyAttempts
 
 
 async def validate_user_credentials(
-        session: get_session, credentials: UserSignInDTO = Body(...)
+        session: get_session,
+        request: Request,
+        redis_session: get_redis_session,
+        credentials: UserSignInDTO = Body(...)
 ) -> UserSecureCredentialsDTO:
+    await check_rate_limit(request, redis_session, credentials.phone)
+
     user = await UserDAO(session).get_by_phone(credentials.phone)
     if user is None:
         raise AuthenticationExceptions.InvalidCredentials
-    if not Hasher.verify_password(credentials.password, user.password):
+    if not await Hasher.async_verify_password(credentials.password, user.password):
         raise AuthenticationExceptions.InvalidCredentials
+
+    if Hasher.needs_rehash(user.password):
+        password = await Hasher.async_get_password_hash(credentials.password)
+        await UserDAO(session).update(UserUpdateDTO(id=user.id), password=password)
     return user
 
 
+def check_bot(bot_token: bot_header_depends):
+    if AUTH_CONFIG.bot_secret is None or bot_token is None:
+        raise AuthenticationExceptions.InvalidBot
+    if not hmac.compare_digest(bot_token.encode(), AUTH_CONFIG.bot_secret.encode()):
+        raise AuthenticationExceptions.InvalidBot
+
+
+async def validate_telegram_user(credentials: TelegramSignInDTO = Body(...)) -> UserRoleDTO:
+    user = await TELEGRAM_CACHE.get(credentials.tg_id)
+    if user is not None:
+        return user
+
+    async with Session() as session:
+        result = await UserDAO(session).get_by_tg_id(credentials.tg_id)
+    if result is None:
+        raise AuthenticationExceptions.TelegramNotLinked
+    await TELEGRAM_CACHE.set(credentials.tg_id, result.id, result.role)
+    return UserRoleDTO.model_construct(id=result.id, role=result.role)
+
+
+async def link_telegram_user(
+        session: get_session,
+        request: Request,
+        redis_session: get_redis_session,
+        credentials: TelegramLinkDTO = Body(...)
+) -> UserRoleDTO:
+    user = await validate_user_credentials(session, request, redis_session, credentials)
+    linked_user = await UserDAO(session).get_by_tg_id(credentials.tg_id)
+    if linked_user is not None and linked_user.id != user.id:
+        raise AuthenticationExceptions.ConflictTelegram
+
+    if linked_user is None:
+        linked, conflict_field = await UserDAO(session).update_or_conflict(
+            UserUpdateDTO(id=user.id), tg_id=credentials.tg_id
+        )
+        if not linked:
+            raise CONFLICT_EXCEPTIONS.get(conflict_field, AuthenticationExceptions.ConflictTelegram)
+    await TELEGRAM_CACHE.set(credentials.tg_id, user.id, user.role)
+    return UserRoleDTO.model_construct(id=user.id, role=user.role)
+
+
 async def update_tokens(
         response: Response,
         refresh_bearer_token: refresh_bearer_depends,
         refresh_cookies_token: refresh_cookies_depends,
         redis_session: get_redis_session
 ) -> AccessTokenDTO:
-    refresh_payload = await check_refresh(refresh_bearer_token, refresh_cookies_token, redis_session)
-    access_payload = await create_tokens(response, refresh_payload.user_id, refresh_payload.role, redis_session)
-    return access_payload
+    refresh_token, refresh_payload = await check_refresh(refresh_bearer_token, refresh_cookies_token, redis_session)
+    REFRESH_COOKIE.set(response, refresh_token)
+    return issue_access_token(response, refresh_payload.user_id, refresh_payload.role)
+
+
+def issue_access_token(response: Response, user_id: UUID, role: str | RoleEnum) -> AccessTokenDTO:
+    if isinstance(role, RoleEnum):
+        role = role.value
+    exp = get_timestamp(AUTH_CONFIG.access_exp_sec)
+    perm = PERMISSION_MODEL.role_masks[role]
+    ACCESS_COOKIE.set(response, JWT.encode({'sub': str(user_id), 'role': role, 'exp': exp, 'perm': perm}))
+    return AccessTokenDTO.model_construct(sub=user_id, role=role, exp=exp, perm=perm)
 
 
 async def create_tokens(
@@ -189,24 +415,9 @@ async def create_tokens(
         role: RoleEnum,
         redis_session: get_redis_session
 ) -> AccessTokenDTO:
-    await AuthenticationDAO(redis_session).pop_refresh_token(user_id=user_id)  # pop old token
-
     refresh_token = await AuthenticationDAO(redis_session).create_refresh_token(user_id, role)
-    response.set_cookie(
-        AUTH_CONFIG.refresh_key,
-        refresh_token,
-        AUTH_CONFIG.refresh_exp_sec,
-        **AUTH_CONFIG.cookies_kwargs()
-    )
-
-    access_payload = AccessTokenDTO.access_fabric(user_id, role, AUTH_CONFIG.access_exp_sec)
-    response.set_cookie(
-        AUTH_CONFIG.access_key,
-        JWT.encode(claims=access_payload.model_dump(mode='json')),
-        AUTH_CONFIG.access_exp_sec,
-        **AUTH_CONFIG.cookies_kwargs()
-    )
-    return access_payload
+    REFRESH_COOKIE.set(response, refresh_token)
+    return issue_access_token(response, user_id, role)
 
 
 async def delete_tokens(
@@ -216,7 +427,12 @@ async def delete_tokens(
 ):
     refresh_token = request.cookies.get(AUTH_CONFIG.refresh_key)
     if refresh_token is not None:
-        await AuthenticationDAO(redis_session).pop_refresh_token(refresh_token=refresh_token)
+        try:
+            await AuthenticationDAO(redis_session).revoke_refresh_token(refresh_token)
+        except HTTPException as e:
+            if e is not AuthenticationExceptions.RefreshReused:
+                raise e
+            logger.warning('Refresh token reuse detected on sign-out, token family revoked.')
 
     response.delete_cookie(AUTH_CONFIG.refresh_key)
     response.delete_cookie(AUTH_CONFIG.access_key)
\ No newline at end of file
@@ -0,0 +1,134 @@
+from typing import Dict, Iterable, Set
+from uuid import UUID
+
+from src.config.cache import CACHE_CONFIG, CacheConfig
+from src.config.redis import REDIS_CONFIG
+from src.database.redis.connection import RedisSession, BotRedisSession
+from src.domain.user.dto import UserSecureCredentialsDTO, UserRoleDTO, RoleEnum
+from src.utils.cache import TTLCache
+
+
+class CredentialsCache:
+    phone_prefix: str = 'user_credentials'
+    id_prefix: str = 'user_credentials_id'
+
+    def __init__(self, config: CacheConfig):
+        self.config = config
+        self.users = TTLCache[str, UserSecureCredentialsDTO](config.credentials_max_size, config.credentials_ttl_sec)
+        self.phones: Dict[UUID, Set[str]] = {}
+
+    @classmethod
+    def phone_key(cls, phone: str) -> str:
+        return f'{cls.phone_prefix}:{phone}'
+
+    @classmethod
+    def id_key(cls, user_id: UUID | str) -> str:
+        return f'{cls.id_prefix}:{str(user_id)}'
+
+    async def get(self, phone: str) -> UserSecureCredentialsDTO | None:
+        if not self.config.credentials_enabled:
+            return None
+        if not self.config.credentials_redis:
+            return self.users.get(phone)
+
+        value = await RedisSession().get_value(self.phone_key(phone))
+        if value is None:
+            return None
+        return UserSecureCredentialsDTO.model_validate_json(value)
+
+    async def set(self, phone: str, user: UserSecureCredentialsDTO):
+        if not self.config.credentials_enabled:
+            return None
+        if not self.config.credentials_redis:
+            self.users.set(phone, user)
+            self.phones.setdefault(user.id, set()).add(phone)
+            if len(self.phones) > 2 * self.config.credentials_max_size:
+                self.prune()
+            return None
+
+        async with RedisSession().pipeline(transaction=False) as pipe:
+            pipe.set(self.phone_key(phone), user.model_dump_json(), ex=self.config.credentials_redis_ttl_sec)
+            pipe.set(self.id_key(user.id), phone, ex=self.config.credentials_redis_ttl_sec)
+
+    def prune(self):
+        self.phones = {
+            user_id: {phone for phone in phones if phone in self.users}
+            for user_id, phones in self.phones.items()
+            if any(phone in self.users for phone in phones)
+        }
+
+    async def invalidate(self, user_ids: Iterable[UUID | str]):
+        if not self.config.credentials_enabled:
+            return None
+
+        user_ids = [UUID(str(user_id)) for user_id in user_ids]
+        if not self.config.credentials_redis:
+            for user_id in user_ids:
+                for phone in self.phones.pop(user_id, ()):
+                    self.users.delete(phone)
+            return None
+
+        if len(user_ids) > 0:
+            redis_session = RedisSession()
+            id_keys = [self.id_key(user_id) for user_id in user_ids]
+            phones = await redis_session.get_values(id_keys)
+            await redis_session.delete_items(
+                id_keys + [self.phone_key(phone) for phone in phones if phone is not None]
+            )
+
+
+class TelegramCache:
+    tg_prefix: str = 'tg'
+    user_prefix: str = 'tg_user'
+
+    def __init__(self, config: CacheConfig):
+        self.config = config
+
+    @staticmethod
+    def bot_key(key: str) -> str:
+        if REDIS_CONFIG.cluster:
+            return f'bot:{key}'
+        return key
+
+    @classmethod
+    def tg_key(cls, tg_id: int) -> str:
+        return cls.bot_key(f'{cls.tg_prefix}:{tg_id}')
+
+    @classmethod
+    def user_key(cls, user_id: UUID | str) -> str:
+        return cls.bot_key(f'{cls.user_prefix}:{str(user_id)}')
+
+    async def get(self, tg_id: int) -> UserRoleDTO | None:
+        if not self.config.telegram_enabled:
+            return None
+
+        value = await BotRedisSession().get_value(self.tg_key(tg_id))
+        if value is None:
+            return None
+        user_id, role = value.split(',', 1)
+        return UserRoleDTO.model_construct(id=UUID(user_id), role=role)
+
+    async def set(self, tg_id: int, user_id: UUID | str, role: str | RoleEnum):
+        if not self.config.telegram_enabled:
+            return None
+
+        if isinstance(role, RoleEnum):
+            role = role.value
+        async with BotRedisSession().pipeline(transaction=False) as pipe:
+            pipe.set(self.tg_key(tg_id), f'{str(user_id)},{role}', ex=self.config.telegram_ttl_sec)
+            pipe.set(self.user_key(user_id), str(tg_id), ex=self.config.telegram_ttl_sec)
+
+    async def invalidate(self, user_ids: Iterable[UUID | str]):
+        if not self.config.telegram_enabled:
+            return None
+
+        user_keys = [self.user_key(user_id) for user_id in user_ids]
+        if len(user_keys) < 1:
+            return None
+        redis_session = BotRedisSession()
+        tg_ids = await redis_session.get_values(user_keys)
+        await redis_session.delete_items(user_keys + [self.tg_key(tg_id) for tg_id in tg_ids if tg_id is not None])
+
+
+CREDENTIALS_CACHE = CredentialsCache(CACHE_CONFIG)
+TELEGRAM_CACHE = TelegramCache(CACHE_CONFIG)
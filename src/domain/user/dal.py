@@ -1,9 +1,11 @@
-from typing import Iterable
+from typing import Iterable, List
 from uuid import UUID
 
 from sqlalchemy import select
 
-from src.domain.abc.dal import AbstractDAO
+from src.config.postgres import POSTGRES_CONFIG
+from src.domain.abc.dal import AbstractDAO, ID, get_projection
+from src.domain.user.cache import CREDENTIALS_CACHE, TELEGRAM_CACHE
 from src.domain.user.dto import UserGetDTO, UserCreateDTO, UserUpdateDTO, UserSecureCredentialsDTO, RoleEnum
 from src.domain.user.model import UserModel
 
@@ -20,43 +22,59 @@ class UserDAO(
     get_scheme = UserGetDTO
     create_scheme = UserCreateDTO
     update_scheme = UserUpdateDTO
+    unique_fields = ('phone', 'tg_id')
+    projected = True
+
+    async def invalidate(self, ids: Iterable[ID]):
+        ids = list(ids)
+        await CREDENTIALS_CACHE.invalidate(ids)
+        await TELEGRAM_CACHE.invalidate(ids)
 
     async def get_by_phone(self, phone: str) -> UserSecureCredentialsDTO | None:
+        user = await CREDENTIALS_CACHE.get(phone)
+        if user is not None:
+            return user
+
+        projection = get_projection(self.model, UserSecureCredentialsDTO)
         query = select(
-            self.model
+            *projection.columns
         ).where(
-            self.model.phone == phone
+            self.model.phone == phone,
+            *self.active_where()
         )
-        result = await self.session.scalar(query)
+        result = (await self.session.execute(query)).first()
         if result is None:
             return None
 
-        return UserSecureCredentialsDTO.model_validate(result)
+        user = projection.build(result)
+        await CREDENTIALS_CACHE.set(phone, user)
+        return user
 
     async def get_by_tg_id(self, telegram_id: int) -> model | None:
         query = select(
             self.model
         ).where(
-            self.model.tg_id == telegram_id
+            self.model.tg_id == telegram_id,
+            *self.active_where()
         )
 
         return await self.session.scalar(query)
 
-    async def get_by_role(self, role: RoleEnum) -> Iterable[model]:
-        query = select(
-            self.model
-        ).where(
-            self.model.role == role
-        )
-
-        return await self.session.scalars(query)
+    async def get_by_role(
+            self,
+            role: RoleEnum,
+            after: UUID | None = None,
+            limit: int = POSTGRES_CONFIG.page_size
+    ) -> List[UserGetDTO]:
+        return await self.get_page(after, limit, role=role)
 
     async def check_role(self, user_id: UUID, role: RoleEnum):
         query = select(
             self.model.role
         ).where(
             self.model.id == user_id,
-            self.model.role == role
+            self.model.role == role,
+            *self.active_where()
         )
         user = (await self.session.execute(query)).one_or_none()
         return user is not None
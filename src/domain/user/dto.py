@@ -1,6 +1,6 @@
 import enum
 import datetime
-from typing import Annotated
+from typing import Annotated, List
 from uuid import UUID
 
 from pydantic import SecretStr, Field
@@ -19,22 +19,26 @@ class GenderEnum(str, enum.Enum):
 
 class RoleEnum(str, enum.Enum):
     CLIENT = 'CLIENT'
+    ADMIN = 'ADMIN'
 
     @classmethod
     def list(cls):
         return list(map(lambda c: c.value, cls))
 
     def __lt__(self, other):
-        return self.list().index(self) < self.list().index(other)
+        return ROLE_RANKS[self] < ROLE_RANKS[other]
 
     def __le__(self, other):
-        return self.list().index(self) <= self.list().index(other)
+        return ROLE_RANKS[self] <= ROLE_RANKS[other]
 
     def __gt__(self, other):
-        return self.list().index(self) > self.list().index(other)
+        return ROLE_RANKS[self] > ROLE_RANKS[other]
 
     def __ge__(self, other):
-        return self.list().index(self) >= self.list().index(other)
+        return ROLE_RANKS[self] >= ROLE_RANKS[other]
+
+
+ROLE_RANKS = {role: rank for rank, role in enumerate(RoleEnum)}
 
 
 class UserCreateDTO(AbstractDTO):
@@ -68,3 +72,38 @@ class UserSecureCredentialsDTO(AbstractDTO):
     id: UUID = Field(...)
     role: RoleEnum = Field(...)
     password: str = Field(...)
+
+
+class UserRoleDTO(AbstractDTO):
+    id: UUID = Field(...)
+    role: RoleEnum = Field(...)
+
+
+class UserImportDTO(AbstractDTO):
+    phone: Annotated[str, PhoneStr]
+    password: SecretStr = Field(...)
+    role: RoleEnum = Field(RoleEnum.CLIENT)
+    first_name: str | None = Field(None, max_length=32)
+    surname: str | None = Field(None, max_length=32)
+    patronymic: str | None = Field(None, max_length=32)
+    gender: GenderEnum | None = Field(None)
+    birthdate: datetime.date | None = Field(None)
+    tg_id: int | None = Field(None)
+
+
+class UserImportIssueDTO(AbstractDTO):
+    line: int = Field(...)
+    detail: str = Field(...)
+
+
+class UserImportReportDTO(AbstractDTO):
+    created: int = Field(0)
+    conflicted: int = Field(0)
+    failed: int = Field(0)
+    conflicts: List[UserImportIssueDTO] = Field(default_factory=list)
+    errors: List[UserImportIssueDTO] = Field(default_factory=list)
+
+
+class UserPageDTO(AbstractDTO):
+    items: List[UserGetDTO] = Field(default_factory=list)
+    next_cursor: UUID | None = Field(None)
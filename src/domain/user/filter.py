@@ -0,0 +1,110 @@
+from typing import Iterable, Dict
+
+from sqlalchemy import select
+
+from src.config.cache import CACHE_CONFIG, CacheConfig
+from src.config.redis import REDIS_CONFIG
+from src.database.postgres.connection import Session
+from src.database.redis.connection import REDIS_CONNECTION, RedisSession
+from src.domain.user.model import UserModel
+from src.utils.bloom import get_bloom_parameters, get_bloom_positions
+from src.utils.metrics import REGISTRY
+
+
+SWAP_FILTER_SCRIPT = REDIS_CONNECTION.register_script('''
+if redis.call('GET', KEYS[3]) == ARGV[1] then
+    redis.call('BITOP', 'OR', KEYS[1], KEYS[1], KEYS[2])
+end
+redis.call('SETBIT', KEYS[1], ARGV[2], 0)
+redis.call('RENAME', KEYS[1], KEYS[2])
+redis.call('SET', KEYS[3], ARGV[1])
+return 1
+''')
+
+
+class PhoneFilter:
+    prefix: str = 'phone_filter'
+
+    def __init__(self, config: CacheConfig):
+        self.config = config
+        prefix = f'{{{self.prefix}}}' if REDIS_CONFIG.cluster else self.prefix
+        self.key = prefix
+        self.rebuild_key = f'{prefix}:rebuild'
+        self.params_key = f'{prefix}:params'
+        self.lock_key = f'{prefix}:lock'
+        self.size_bits, self.hashes = get_bloom_parameters(config.phone_filter_capacity, config.phone_filter_error_rate)
+        self.params = f'{self.size_bits}:{self.hashes}'
+
+    @property
+    def memory_bytes(self) -> int:
+        return (self.size_bits + 7) // 8
+
+    async def might_contain(self, phone: str) -> bool:
+        if not self.config.phone_filter_enabled:
+            return True
+
+        results = []
+        async with RedisSession().pipeline(transaction=False, results=results) as pipe:
+            pipe.get(self.params_key)
+            for position in get_bloom_positions(phone, self.size_bits, self.hashes):
+                pipe.getbit(self.key, position)
+        params, *bits = results
+        return params != self.params or all(bits)
+
+    async def add(self, phones: Iterable[str], key: str | None = None):
+        if not self.config.phone_filter_enabled:
+            return None
+
+        async with RedisSession().pipeline(transaction=False) as pipe:
+            for phone in phones:
+                for position in get_bloom_positions(phone, self.size_bits, self.hashes):
+                    pipe.setbit(key or self.key, position, 1)
+
+    async def rebuild(self, batch_size: int = 10_000) -> int:
+        redis_session = RedisSession()
+        await redis_session.delete_item(self.rebuild_key)
+
+        added = 0
+        async with Session() as session:
+            result = await session.stream_scalars(select(UserModel.phone).execution_options(yield_per=batch_size))
+            async for phones in result.partitions():
+                await self.add(phones, self.rebuild_key)
+                added += len(phones)
+
+        await redis_session.run_script(
+            SWAP_FILTER_SCRIPT, [self.rebuild_key, self.key, self.params_key], [self.params, self.size_bits - 1]
+        )
+        return added
+
+    async def ensure_built(self):
+        if not self.config.phone_filter_enabled:
+            return None
+
+        redis_session = RedisSession()
+        if await redis_session.get_value(self.params_key) == self.params:
+            return None
+        if await redis_session.connection.set(self.lock_key, 1, nx=True, ex=self.config.phone_filter_build_lock_sec):
+            try:
+                await self.rebuild()
+            finally:
+                await redis_session.delete_item(self.lock_key)
+
+    async def get_info(self) -> Dict[str, int | float]:
+        return {
+            'size_bits': self.size_bits,
+            'hashes': self.hashes,
+            'capacity': self.config.phone_filter_capacity,
+            'error_rate': self.config.phone_filter_error_rate,
+            'memory_bytes': await RedisSession().connection.strlen(self.key),
+        }
+
+
+PHONE_FILTER = PhoneFilter(CACHE_CONFIG)
+REGISTRY.gauge(
+    'phone_filter', 'Phone number Bloom filter parameters.', ('statistic',),
+    lambda: {
+        ('size_bits',): PHONE_FILTER.size_bits,
+        ('hashes',): PHONE_FILTER.hashes,
+        ('memory_bytes',): PHONE_FILTER.memory_bytes,
+    }
+)
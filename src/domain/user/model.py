@@ -1,7 +1,7 @@
 import datetime
 from uuid import uuid4
 
-from sqlalchemy import String, UUID, func, ForeignKey, BigInteger, Date
+from sqlalchemy import String, UUID, func, ForeignKey, BigInteger, Date, Index, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.database.postgres.abstract_model import AbstractModel
@@ -21,6 +21,11 @@ class GenderModel(AbstractModel):
 
 class UserModel(AbstractModel):
     __tablename__ = 'user_table'
+    __table_args__ = (
+        Index('ix_user_table_phone_active', 'phone', postgresql_where=text('deleted_at IS NULL')),
+        Index('ix_user_table_tg_id_active', 'tg_id', postgresql_where=text('deleted_at IS NULL')),
+        Index('ix_user_table_role_active', 'role', 'id', postgresql_where=text('deleted_at IS NULL')),
+    )
 
     id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid4, server_default=func.gen_random_uuid()
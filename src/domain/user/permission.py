@@ -0,0 +1,67 @@
+import enum
+from typing import Dict, Iterable, Tuple
+
+from src.domain.user.dto import RoleEnum
+
+
+class PermissionEnum(str, enum.Enum):
+    TOKENS_REFRESH = 'TOKENS_REFRESH'
+    USERS_READ = 'USERS_READ'
+    USERS_WRITE = 'USERS_WRITE'
+
+    @classmethod
+    def list(cls):
+        return list(map(lambda c: c.value, cls))
+
+
+ROLE_PARENTS: Dict[RoleEnum, Tuple[RoleEnum, ...]] = {
+    RoleEnum.CLIENT: (),
+    RoleEnum.ADMIN: (RoleEnum.CLIENT,),
+}
+
+ROLE_PERMISSIONS: Dict[RoleEnum, Tuple[PermissionEnum, ...]] = {
+    RoleEnum.CLIENT: (PermissionEnum.TOKENS_REFRESH,),
+    RoleEnum.ADMIN: (PermissionEnum.USERS_READ, PermissionEnum.USERS_WRITE),
+}
+
+
+class PermissionModel:
+    __slots__ = ('permission_bits', 'role_bits', 'role_masks')
+
+    def __init__(
+            self,
+            parents: Dict[RoleEnum, Tuple[RoleEnum, ...]],
+            permissions: Dict[RoleEnum, Tuple[PermissionEnum, ...]]
+    ):
+        self.permission_bits = {permission: 1 << index for index, permission in enumerate(PermissionEnum)}
+        self.role_bits = {role: 1 << index for index, role in enumerate(RoleEnum)}
+        self.role_masks = {role: self.compile_role(role, parents, permissions, ()) for role in RoleEnum}
+
+    def compile_role(
+            self,
+            role: RoleEnum,
+            parents: Dict[RoleEnum, Tuple[RoleEnum, ...]],
+            permissions: Dict[RoleEnum, Tuple[PermissionEnum, ...]],
+            path: Tuple[RoleEnum, ...]
+    ) -> int:
+        if role in path:
+            raise ValueError(f'Role inheritance cycle: {" -> ".join((*path, role))}')
+        mask = self.permissions_mask(permissions.get(role, ()))
+        for parent in parents.get(role, ()):
+            mask |= self.compile_role(parent, parents, permissions, (*path, role))
+        return mask
+
+    def roles_mask(self, roles: Iterable[RoleEnum]) -> int:
+        mask = 0
+        for role in roles:
+            mask |= self.role_bits[role]
+        return mask
+
+    def permissions_mask(self, permissions: Iterable[PermissionEnum]) -> int:
+        mask = 0
+        for permission in permissions:
+            mask |= self.permission_bits[permission]
+        return mask
+
+
+PERMISSION_MODEL = PermissionModel(ROLE_PARENTS, ROLE_PERMISSIONS)
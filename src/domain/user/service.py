@@ -1,16 +1,217 @@
+import asyncio
+import csv
+import json
+from typing import AsyncIterator, List, Tuple, Dict, Literal, Any, Callable
+from uuid import UUID
+
+from starlette.requests import Request
+
+from src.config.postgres import POSTGRES_CONFIG
+from src.database.postgres.connection import Session
 from src.database.postgres.depends import get_session
-from src.domain.authentication.exception import AuthenticationExceptions
-from src.domain.authentication.service import Hasher
+from src.database.redis.depends import get_redis_session
+from src.domain.authentication.exception import AuthenticationExceptions, CONFLICT_EXCEPTIONS
+from src.domain.authentication.service import Hasher, check_rate_limit
 from src.domain.user.dal import UserDAO
-from src.domain.user.dto import UserCreateDTO, UserGetDTO, RoleEnum
+from src.domain.user.dto import UserCreateDTO, UserGetDTO, RoleEnum, UserImportDTO, UserImportReportDTO, \
+    UserImportIssueDTO, UserPageDTO
+from src.domain.user.filter import PHONE_FILTER
+from src.utils.generator import LineQueue
+
+
+IMPORT_ISSUE_SAMPLE_SIZE = 100
+
 
+async def user_create(
+        session: get_session,
+        request: Request,
+        redis_session: get_redis_session,
+        user_data: UserCreateDTO
+) -> UserGetDTO:
+    if user_data.role != RoleEnum.CLIENT:
+        raise AuthenticationExceptions.InvalidRole
+    await check_rate_limit(request, redis_session, user_data.phone)
 
-async def user_create(session: get_session, user_data: UserCreateDTO) -> UserGetDTO:
-    conflict_by_phone_user = await UserDAO(session).get_by_phone(phone=user_data.phone)
-    if conflict_by_phone_user is not None:
-        raise AuthenticationExceptions.ConflictPhone
+    if await PHONE_FILTER.might_contain(user_data.phone):
+        conflict_by_phone_user = await UserDAO(session).get_by_phone(phone=user_data.phone)
+        if conflict_by_phone_user is not None:
+            raise AuthenticationExceptions.ConflictPhone
 
-    user_data.password = Hasher.get_password_hash(user_data.password)
+    user_data.password = await Hasher.async_get_password_hash(user_data.password)
     data_to_insert = UserCreateDTO.model_validate(user_data)
-    new_user = await UserDAO(session).create(data_to_insert)
+    new_user, conflict_field = await UserDAO(session).create_or_conflict(data_to_insert)
+    if new_user is None:
+        raise CONFLICT_EXCEPTIONS.get(conflict_field, AuthenticationExceptions.ConflictUser)
+
+    await PHONE_FILTER.add((new_user.phone,))
     return new_user
+
+
+ImportIssueSink = Callable[[str, UserImportIssueDTO], None]
+
+
+def add_import_issue(
+        report: UserImportReportDTO,
+        kind: Literal['conflicts', 'errors'],
+        issue: UserImportIssueDTO,
+        sink: ImportIssueSink | None = None
+):
+    if kind == 'conflicts':
+        report.conflicted += 1
+    else:
+        report.failed += 1
+    issues = getattr(report, kind)
+    if len(issues) < IMPORT_ISSUE_SAMPLE_SIZE:
+        issues.append(issue)
+    if sink is not None:
+        sink(kind, issue)
+
+
+def add_import_conflicts(
+        report: UserImportReportDTO,
+        lines: List[int],
+        conflicts: Dict[int, str | None],
+        sink: ImportIssueSink | None = None
+):
+    for index, field in sorted(conflicts.items()):
+        exception = CONFLICT_EXCEPTIONS.get(field, AuthenticationExceptions.ConflictUser)
+        issue = UserImportIssueDTO(line=lines[index], detail=exception.detail)
+        add_import_issue(report, 'conflicts', issue, sink)
+
+
+async def import_users_chunk(
+        rows: List[Tuple[int, UserImportDTO]],
+        report: UserImportReportDTO,
+        sink: ImportIssueSink | None = None
+):
+    lines = [line for line, _ in rows]
+    data = [row.model_dump(exclude_none=True) for _, row in rows]
+    async with Session.begin() as session:
+        conflicts = await UserDAO(session).get_conflict_fields(data)
+    add_import_conflicts(report, lines, conflicts, sink)
+
+    lines = [line for index, line in enumerate(lines) if index not in conflicts]
+    data = [item for index, item in enumerate(data) if index not in conflicts]
+    passwords = await asyncio.gather(*(Hasher.async_get_password_hash(item['password']) for item in data))
+    for item, password in zip(data, passwords):
+        item['password'] = password
+
+    async with Session.begin() as session:
+        created, conflicts = await UserDAO(session).create_list_or_conflict(data)
+    add_import_conflicts(report, lines, conflicts, sink)
+
+    await PHONE_FILTER.add(user.phone for user in created)
+    report.created += len(created)
+
+
+async def parse_import_rows(
+        lines: AsyncIterator[str],
+        file_format: str = 'jsonl'
+) -> AsyncIterator[Tuple[int, Dict[str, Any] | None, str | None]]:
+    queue = LineQueue()
+    reader = csv.reader(queue)
+    header = None
+    open_quote = False
+    start = line = 0
+
+    try:
+        async for raw_line in lines:
+            line += 1
+            if file_format != 'csv':
+                if raw_line.strip():
+                    try:
+                        row = json.loads(raw_line)
+                    except ValueError as e:
+                        yield line, None, str(e)
+                    else:
+                        yield line, row, None
+                continue
+
+            if not open_quote:
+                start = line
+            queue.append(raw_line + '\n')
+            open_quote = open_quote != (raw_line.count('"') % 2 == 1)
+            if open_quote:
+                continue
+
+            try:
+                values = next(reader)
+            except csv.Error as e:
+                queue.clear()
+                yield start, None, str(e)
+                continue
+            if len(values) < 1 or not any(value.strip() for value in values):
+                continue
+            if header is None:
+                header = values
+                continue
+            yield start, dict(zip(header, values)), None
+    except UnicodeDecodeError:
+        raise AuthenticationExceptions.InvalidImportEncoding
+
+    if open_quote:
+        yield start, None, 'Unterminated quoted field.'
+
+
+async def import_users(
+        lines: AsyncIterator[str],
+        file_format: str = 'jsonl',
+        chunk_size: int = 1000,
+        sink: ImportIssueSink | None = None
+) -> UserImportReportDTO:
+    report = UserImportReportDTO()
+    rows: List[Tuple[int, UserImportDTO]] = []
+
+    async for line, row, error in parse_import_rows(lines, file_format):
+        if error is not None:
+            add_import_issue(report, 'errors', UserImportIssueDTO(line=line, detail=error), sink)
+            continue
+
+        try:
+            row = UserImportDTO.model_validate({key: value for key, value in row.items() if value not in ('', None)})
+        except (ValueError, AttributeError) as e:
+            add_import_issue(report, 'errors', UserImportIssueDTO(line=line, detail=str(e)), sink)
+            continue
+
+        rows.append((line, row))
+        if len(rows) >= chunk_size:
+            await import_users_chunk(rows, report, sink)
+            rows = []
+
+    if len(rows) > 0:
+        await import_users_chunk(rows, report, sink)
+    return report
+
+
+async def list_users(
+        session: get_session,
+        role: RoleEnum | None = None,
+        after: UUID | None = None,
+        limit: int = POSTGRES_CONFIG.page_size
+) -> UserPageDTO:
+    filters = {} if role is None else {'role': role}
+    users = await UserDAO(session).get_page(after, limit, **filters)
+    return UserPageDTO(items=users, next_cursor=users[-1].id if len(users) == limit else None)
+
+
+async def export_users(
+        role: RoleEnum | None = None,
+        file_format: Literal['ndjson', 'json'] = 'ndjson'
+) -> AsyncIterator[bytes]:
+    filters = {} if role is None else {'role': role}
+    separator = b'\n' if file_format == 'ndjson' else b','
+    if file_format == 'json':
+        yield b'['
+
+    first = True
+    async with Session.begin() as session:
+        async for users in UserDAO(session).stream(**filters):
+            chunk = separator.join(user.model_dump_json().encode() for user in users)
+            if file_format == 'ndjson':
+                yield chunk + separator
+            else:
+                yield chunk if first else separator + chunk
+            first = False
+
+    if file_format == 'json':
+        yield b']'
@@ -0,0 +1,16 @@
+import hashlib
+import math
+from typing import List, Tuple
+
+
+def get_bloom_parameters(capacity: int, error_rate: float) -> Tuple[int, int]:
+    size_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+    hashes = max(1, round(size_bits / capacity * math.log(2)))
+    return size_bits, hashes
+
+
+def get_bloom_positions(value: str, size_bits: int, hashes: int) -> List[int]:
+    digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+    first = int.from_bytes(digest[:8], 'little')
+    second = int.from_bytes(digest[8:], 'little') | 1
+    return [(first + index * second) % size_bits for index in range(hashes)]
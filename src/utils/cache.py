@@ -0,0 +1,53 @@
+import time
+from collections import OrderedDict
+from typing import Hashable
+
+
+class TTLCache[K: Hashable, V]:
+    __slots__ = ('max_size', 'ttl_sec', 'hits', 'misses', '_items')
+
+    def __init__(self, max_size: int, ttl_sec: int | float | None = None):
+        self.max_size = max_size
+        self.ttl_sec = ttl_sec
+        self.hits = 0
+        self.misses = 0
+        self._items: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._items
+
+    def get(self, key: K) -> V | None:
+        item = self._items.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._items[key]
+            self.misses += 1
+            return None
+
+        self._items.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl_sec: int | float | None = None):
+        if ttl_sec is None:
+            ttl_sec = self.ttl_sec
+        if self.max_size < 1 or ttl_sec is None or ttl_sec <= 0:
+            return None
+
+        self._items[key] = (time.monotonic() + ttl_sec, value)
+        self._items.move_to_end(key)
+        if len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def delete(self, key: K):
+        self._items.pop(key, None)
+
+    def clear(self):
+        self._items.clear()
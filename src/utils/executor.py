@@ -0,0 +1,62 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Any
+
+
+class BoundedProcessExecutor:
+    __slots__ = ('max_workers', 'max_in_flight', 'start_method', 'waiting', 'in_flight', '_executor', '_semaphore')
+
+    def __init__(self, max_workers: int = 0, max_in_flight: int = 0, start_method: str = 'forkserver'):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight or self.max_workers * 2
+        self.start_method = start_method
+        self.waiting = 0
+        self.in_flight = 0
+        self._executor: ProcessPoolExecutor | None = None
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+
+    @property
+    def queue_depth(self) -> int:
+        return self.waiting + self.in_flight
+
+    async def run[T](self, func: Callable[..., T], *args: Any) -> T:
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context(self.start_method)
+                )
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+class ConcurrencyLimiter:
+    __slots__ = ('limit', 'active')
+
+    def __init__(self, limit: int = 0):
+        self.limit = limit
+        self.active = 0
+
+    def try_acquire(self) -> bool:
+        if 0 < self.limit <= self.active:
+            return False
+        self.active += 1
+        return True
+
+    def release(self):
+        self.active -= 1
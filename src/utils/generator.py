@@ -1,4 +1,5 @@
-from typing import Iterable
+from collections import deque
+from typing import Iterable, AsyncIterable
 
 import asyncio
 
@@ -6,4 +7,36 @@ import asyncio
 async def sleep_generator[T](iterable: Iterable[T], sleep_sec: int | float = 0) -> T:
     for item in iterable:
         yield item
-        await asyncio.sleep(sleep_sec)
\ No newline at end of file
+        await asyncio.sleep(sleep_sec)
+
+
+async def line_generator(chunks: AsyncIterable[bytes], encoding: str = 'utf8') -> str:
+    buffer = b''
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b'\n')
+        for line in lines:
+            yield line.decode(encoding).rstrip('\r')
+    if buffer:
+        yield buffer.decode(encoding).rstrip('\r')
+
+
+class LineQueue:
+    __slots__ = ('lines',)
+
+    def __init__(self):
+        self.lines: deque[str] = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if len(self.lines) < 1:
+            raise StopIteration
+        return self.lines.popleft()
+
+    def append(self, line: str):
+        self.lines.append(line)
+
+    def clear(self):
+        self.lines.clear()
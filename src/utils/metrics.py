@@ -0,0 +1,102 @@
+import functools
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Tuple, Awaitable
+
+Labels = Tuple[str, ...]
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+def format_labels(label_names: Labels, labels: Labels, **extra: str) -> str:
+    pairs = [*zip(label_names, labels), *extra.items()]
+    if len(pairs) < 1:
+        return ''
+    return '{' + ','.join(f'{name}="{value}"' for name, value in pairs) + '}'
+
+
+class Histogram:
+    __slots__ = ('name', 'description', 'label_names', 'buckets', '_series')
+
+    def __init__(
+            self,
+            name: str,
+            description: str,
+            label_names: Labels = (),
+            buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series: Dict[Labels, list] = {}
+
+    def observe(self, value: float, *labels: str):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.description}', f'# TYPE {self.name} histogram']
+        for labels, (counts, total) in self._series.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, '+Inf'), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{format_labels(self.label_names, labels, le=str(bound))} {cumulative}')
+            lines.append(f'{self.name}_sum{format_labels(self.label_names, labels)} {total}')
+            lines.append(f'{self.name}_count{format_labels(self.label_names, labels)} {cumulative}')
+        return lines
+
+
+class Gauge:
+    __slots__ = ('name', 'description', 'label_names', 'callback')
+
+    def __init__(self, name: str, description: str, label_names: Labels, callback: Callable[[], Dict[Labels, float]]):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.callback = callback
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.description}', f'# TYPE {self.name} gauge']
+        for labels, value in self.callback().items():
+            lines.append(f'{self.name}{format_labels(self.label_names, labels)} {value}')
+        return lines
+
+
+class Registry:
+    __slots__ = ('metrics',)
+
+    def __init__(self):
+        self.metrics: Dict[str, Histogram | Gauge] = {}
+
+    def histogram(self, name: str, description: str, label_names: Labels = (), **kwargs) -> Histogram:
+        return self.metrics.setdefault(name, Histogram(name, description, label_names, **kwargs))
+
+    def gauge(self, name: str, description: str, label_names: Labels, callback: Callable[[], Dict[Labels, float]]):
+        return self.metrics.setdefault(name, Gauge(name, description, label_names, callback))
+
+    def render(self) -> str:
+        return '\n'.join(line for metric in self.metrics.values() for line in metric.render()) + '\n'
+
+
+REGISTRY = Registry()
+
+
+def observe_latency[**P, T](
+        histogram: Histogram, *labels: str
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
+    def decorator(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            started_at = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started_at, *labels)
+        return wrapper
+    return decorator
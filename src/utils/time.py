@@ -1,4 +1,5 @@
 import datetime
+import time
 
 
 DATE_FORMAT: str = '%d-%m-%Y'
@@ -27,6 +28,8 @@ def get_now_with_delta(
     )
     if is_date:
         return (datetime.datetime.now(datetime.UTC) + delta).date()
-    return datetime.datetime.strptime(
-        (datetime.datetime.now(datetime.UTC) + delta).strftime(FULL_FORMAT), FULL_FORMAT
-    )
+    return (datetime.datetime.now(datetime.UTC) + delta).replace(microsecond=0, tzinfo=None)
+
+
+def get_timestamp(seconds: int = 0) -> int:
+    return int(time.time()) + seconds
@@ -0,0 +1,58 @@
+import asyncio
+import uuid
+from typing import Any, Iterable, List
+
+from src.database.postgres.connection import run_after_commit
+from src.domain.abc.dal import ID
+from src.domain.user.dal import UserDAO
+from src.domain.user.dto import UserUpdateDTO
+
+
+class SessionStub:
+    def __init__(self):
+        self.info = {}
+        self.statements: List[Any] = []
+
+    async def execute(self, statement: Any, *args: Any):
+        self.statements.append(statement)
+
+
+class RecordingUserDAO(UserDAO):
+    def __init__(self, session: SessionStub):
+        super().__init__(session)
+        self.invalidated: List[List[ID]] = []
+
+    async def invalidate(self, ids: Iterable[ID]):
+        self.invalidated.append(list(ids))
+
+
+def test_update_invalidates_before_and_after_commit():
+    async def scenario():
+        session = SessionStub()
+        dao = RecordingUserDAO(session)
+        user_id = uuid.uuid4()
+
+        await dao.update(UserUpdateDTO(id=user_id, first_name='Name'))
+        assert len(session.statements) == 1
+        assert dao.invalidated == [[user_id]]
+
+        await run_after_commit(session)
+        assert dao.invalidated == [[user_id], [user_id]]
+        assert 'after_commit' not in session.info
+
+    asyncio.run(scenario())
+
+
+def test_write_paths_invalidate():
+    async def scenario():
+        session = SessionStub()
+        dao = RecordingUserDAO(session)
+        first_id, second_id = uuid.uuid4(), uuid.uuid4()
+
+        await dao.update_list([{'id': first_id, 'first_name': 'Name'}])
+        await dao.delete_list([second_id])
+        await dao.deactivate(first_id)
+        assert dao.invalidated == [[first_id], [second_id], [first_id]]
+        assert len(session.info['after_commit']) == 3
+
+    asyncio.run(scenario())
@@ -0,0 +1,49 @@
+import asyncio
+import uuid
+
+from src.config.cache import CacheConfig
+from src.domain.user.cache import CredentialsCache
+from src.domain.user.dto import UserSecureCredentialsDTO
+
+
+def get_user() -> UserSecureCredentialsDTO:
+    return UserSecureCredentialsDTO(id=uuid.uuid4(), role='CLIENT', password='hash')
+
+
+def test_invalidate_after_hits_under_eviction():
+    async def scenario():
+        cache = CredentialsCache(CacheConfig(credentials_enabled=True, credentials_max_size=2))
+        user = get_user()
+        await cache.set('70000000000', user)
+        for index in range(1, 10):
+            assert await cache.get('70000000000') == user
+            await cache.set(f'7000000000{index}', get_user())
+
+        await cache.invalidate([user.id])
+        assert await cache.get('70000000000') is None
+
+    asyncio.run(scenario())
+
+
+def test_invalidate_all_phones_of_user():
+    async def scenario():
+        cache = CredentialsCache(CacheConfig(credentials_enabled=True))
+        user = get_user()
+        await cache.set('70000000000', user)
+        await cache.set('70000000001', user)
+
+        await cache.invalidate([str(user.id)])
+        assert await cache.get('70000000000') is None
+        assert await cache.get('70000000001') is None
+
+    asyncio.run(scenario())
+
+
+def test_reverse_map_stays_bounded():
+    async def scenario():
+        cache = CredentialsCache(CacheConfig(credentials_enabled=True, credentials_max_size=3))
+        for index in range(100):
+            await cache.set(f'700000000{index:02d}', get_user())
+        assert len(cache.phones) <= 2 * 3
+
+    asyncio.run(scenario())
@@ -0,0 +1,23 @@
+import asyncio
+
+from src.config.auth import AuthConfig
+from src.utils.executor import BoundedProcessExecutor
+
+
+def test_process_executor_runs_in_forkserver():
+    async def scenario():
+        executor = BoundedProcessExecutor(max_workers=2)
+        try:
+            assert await asyncio.gather(*(executor.run(pow, 2, power) for power in range(4))) == [1, 2, 4, 8]
+            assert executor.queue_depth == 0
+        finally:
+            executor.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_hash_workers_split_between_server_workers(monkeypatch):
+    monkeypatch.setattr('os.cpu_count', lambda: 8)
+    assert AuthConfig(web_concurrency=4).get_hash_workers() == 2
+    assert AuthConfig(web_concurrency=16).get_hash_workers() == 1
+    assert AuthConfig(web_concurrency=4, hash_workers=3).get_hash_workers() == 3
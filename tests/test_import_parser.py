@@ -0,0 +1,43 @@
+import asyncio
+from typing import AsyncIterator, List
+
+from src.domain.user.service import parse_import_rows
+
+
+async def iterate(lines: List[str]) -> AsyncIterator[str]:
+    for line in lines:
+        yield line
+
+
+def parse(lines: List[str], file_format: str) -> list:
+    async def scenario():
+        return [row async for row in parse_import_rows(iterate(lines), file_format)]
+
+    return asyncio.run(scenario())
+
+
+def test_csv_rows_with_header():
+    rows = parse(['phone,first_name', '70000000000,Name', '', '70000000001,Other'], 'csv')
+    assert rows == [
+        (2, {'phone': '70000000000', 'first_name': 'Name'}, None),
+        (4, {'phone': '70000000001', 'first_name': 'Other'}, None)
+    ]
+
+
+def test_csv_quoted_field_across_lines():
+    rows = parse(['phone,first_name', '70000000000,"Name', 'Line"', '70000000001,"a ""b"""'], 'csv')
+    assert rows == [
+        (2, {'phone': '70000000000', 'first_name': 'Name\nLine'}, None),
+        (4, {'phone': '70000000001', 'first_name': 'a "b"'}, None)
+    ]
+
+
+def test_csv_unterminated_quote():
+    rows = parse(['phone,first_name', '70000000000,"Name'], 'csv')
+    assert rows == [(2, None, 'Unterminated quoted field.')]
+
+
+def test_jsonl_rows_and_errors():
+    rows = parse(['{"phone": "70000000000"}', '', '{broken'], 'jsonl')
+    assert rows[0] == (1, {'phone': '70000000000'}, None)
+    assert rows[1][0] == 3 and rows[1][1] is None and rows[1][2] is not None
@@ -0,0 +1,58 @@
+import asyncio
+
+import fakeredis
+import pytest
+
+from src.config.redis import REDIS_CONFIG
+from src.database.redis.connection import RedisSession
+from src.domain.authentication.dal import RateLimitDAO
+
+
+def get_dao() -> RateLimitDAO:
+    redis_session = RedisSession()
+    redis_session.connection = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    return RateLimitDAO(redis_session)
+
+
+def limit_scenario():
+    async def scenario():
+        dao = get_dao()
+        phone_key = RateLimitDAO.limit_key('phone', '70000000000')
+        ip_key = RateLimitDAO.limit_key('ip', '127.0.0.1')
+
+        assert await dao.hit({phone_key: 2, ip_key: 3}, 60)
+        assert await dao.hit({phone_key: 2, ip_key: 3}, 60)
+        assert not await dao.hit({phone_key: 2, ip_key: 3}, 60)
+
+        connection = dao.redis_session.connection
+        assert await connection.zcard(phone_key) == 2
+        assert await connection.zcard(ip_key) == 2
+        assert 0 < await connection.pttl(ip_key) <= 60 * 1000
+
+        other_phone_key = RateLimitDAO.limit_key('phone', '70000000001')
+        assert await dao.hit({other_phone_key: 2, ip_key: 3}, 60)
+        assert not await dao.hit({other_phone_key: 2, ip_key: 3}, 60)
+        assert await connection.zcard(other_phone_key) == 1
+
+    asyncio.run(scenario())
+
+
+def test_hit_counts_only_admitted_attempts():
+    limit_scenario()
+
+
+def test_hit_counts_only_admitted_attempts_in_cluster(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(REDIS_CONFIG, 'cluster', True)
+    limit_scenario()
+
+
+def test_hit_expires_old_attempts():
+    async def scenario():
+        dao = get_dao()
+        key = RateLimitDAO.limit_key('phone', '70000000000')
+        await dao.redis_session.connection.zadd(key, {'old': 0})
+
+        assert await dao.hit({key: 1}, 60)
+        assert 'old' not in await dao.redis_session.connection.zrange(key, 0, -1)
+
+    asyncio.run(scenario())
@@ -0,0 +1,46 @@
+import asyncio
+
+import fakeredis
+
+from src.database.redis.connection import RedisSession
+
+
+def get_redis_session() -> RedisSession:
+    redis_session = RedisSession()
+    redis_session.connection = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    return redis_session
+
+
+def test_pipeline_collects_results():
+    async def scenario():
+        redis_session = get_redis_session()
+        results = []
+        async with redis_session.pipeline(results=results) as pipe:
+            pipe.set('key', 'value')
+            pipe.get('key')
+        assert results == [True, 'value']
+
+    asyncio.run(scenario())
+
+
+def test_pipeline_without_results():
+    async def scenario():
+        redis_session = get_redis_session()
+        async with redis_session.pipeline(transaction=False) as pipe:
+            pipe.set('key', 'value')
+        assert await redis_session.get_value('key') == 'value'
+
+    asyncio.run(scenario())
+
+
+def test_delete_values():
+    async def scenario():
+        redis_session = get_redis_session()
+        for index in range(5):
+            await redis_session.set_item(f'prefix:{index}', 'value')
+        await redis_session.set_item('other', 'value')
+
+        assert await redis_session.delete_values('prefix:*', batch_size=2, sleep_sec=0) == 5
+        assert await redis_session.get_keys() == ['other']
+
+    asyncio.run(scenario())
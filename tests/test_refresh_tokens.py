@@ -0,0 +1,185 @@
+import asyncio
+import uuid
+
+import fakeredis
+import pytest
+from fastapi import HTTPException
+
+from src.config.auth import AUTH_CONFIG
+from src.database.redis.connection import RedisSession
+from src.domain.authentication.dal import AuthenticationDAO
+from src.domain.authentication.exception import AuthenticationExceptions
+
+
+def get_dao() -> AuthenticationDAO:
+    redis_session = RedisSession()
+    redis_session.connection = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    return AuthenticationDAO(redis_session)
+
+
+def assert_reused(exception_info: pytest.ExceptionInfo):
+    assert exception_info.value is AuthenticationExceptions.RefreshReused
+
+
+def test_rotate_refresh_token():
+    async def scenario():
+        dao = get_dao()
+        user_id = uuid.uuid4()
+        refresh_token = await dao.create_refresh_token(user_id, 'CLIENT')
+
+        new_refresh_token, payload = await dao.rotate_refresh_token(refresh_token)
+        assert new_refresh_token != refresh_token
+        assert payload.user_id == user_id and payload.role == 'CLIENT'
+
+        newest_refresh_token, payload = await dao.rotate_refresh_token(new_refresh_token)
+        assert newest_refresh_token is not None and payload.user_id == user_id
+
+    asyncio.run(scenario())
+
+
+def test_reused_refresh_token_revokes_family():
+    async def scenario():
+        dao = get_dao()
+        user_id = uuid.uuid4()
+        refresh_token = await dao.create_refresh_token(user_id, 'CLIENT')
+        rotated_refresh_token, _ = await dao.rotate_refresh_token(refresh_token)
+        new_refresh_token, _ = await dao.rotate_refresh_token(rotated_refresh_token)
+
+        with pytest.raises(HTTPException) as exception_info:
+            await dao.rotate_refresh_token(refresh_token)
+        assert_reused(exception_info)
+
+        assert await dao.rotate_refresh_token(new_refresh_token) == (None, None)
+        assert await dao.redis_session.connection.exists(dao.user_key(user_id)) == 0
+
+    asyncio.run(scenario())
+
+
+def test_revoke_with_rotated_secret_revokes_family():
+    async def scenario():
+        dao = get_dao()
+        refresh_token = await dao.create_refresh_token(uuid.uuid4(), 'CLIENT')
+        rotated_refresh_token, _ = await dao.rotate_refresh_token(refresh_token)
+        new_refresh_token, _ = await dao.rotate_refresh_token(rotated_refresh_token)
+
+        with pytest.raises(HTTPException) as exception_info:
+            await dao.revoke_refresh_token(refresh_token)
+        assert_reused(exception_info)
+
+        assert await dao.rotate_refresh_token(new_refresh_token) == (None, None)
+
+    asyncio.run(scenario())
+
+
+def test_repeated_rotation_within_grace_returns_current_token():
+    async def scenario():
+        dao = get_dao()
+        user_id = uuid.uuid4()
+        refresh_token = await dao.create_refresh_token(user_id, 'CLIENT')
+
+        first = await dao.rotate_refresh_token(refresh_token)
+        second = await dao.rotate_refresh_token(refresh_token)
+        assert first[0] == second[0]
+        assert second[1].user_id == user_id
+
+        assert (await dao.rotate_refresh_token(second[0]))[0] is not None
+
+    asyncio.run(scenario())
+
+
+def test_repeated_rotation_after_grace_revokes_family(monkeypatch):
+    async def scenario():
+        dao = get_dao()
+        refresh_token = await dao.create_refresh_token(uuid.uuid4(), 'CLIENT')
+        new_refresh_token, _ = await dao.rotate_refresh_token(refresh_token)
+
+        with pytest.raises(HTTPException) as exception_info:
+            await dao.rotate_refresh_token(refresh_token)
+        assert_reused(exception_info)
+        assert await dao.rotate_refresh_token(new_refresh_token) == (None, None)
+
+    monkeypatch.setattr(AUTH_CONFIG, 'refresh_reuse_grace_sec', 0)
+    asyncio.run(scenario())
+
+
+def test_revoke_refresh_token():
+    async def scenario():
+        dao = get_dao()
+        refresh_token = await dao.create_refresh_token(uuid.uuid4(), 'CLIENT')
+
+        await dao.revoke_refresh_token(refresh_token)
+        assert await dao.rotate_refresh_token(refresh_token) == (None, None)
+
+    asyncio.run(scenario())
+
+
+def test_issue_replaces_previous_family():
+    async def scenario():
+        dao = get_dao()
+        user_id = uuid.uuid4()
+        refresh_token = await dao.create_refresh_token(user_id, 'CLIENT')
+        new_refresh_token = await dao.create_refresh_token(user_id, 'ADMIN')
+
+        assert await dao.rotate_refresh_token(refresh_token) == (None, None)
+        _, payload = await dao.rotate_refresh_token(new_refresh_token)
+        assert payload.role == 'ADMIN'
+
+    asyncio.run(scenario())
+
+
+async def set_baseline_token(dao: AuthenticationDAO, user_id: uuid.UUID) -> str:
+    refresh_token = str(uuid.uuid4())
+    await dao.redis_session.connection.set(f'{refresh_token},{user_id}', 'CLIENT', ex=60)
+    return refresh_token
+
+
+def test_migrate_baseline_token_into_family():
+    async def scenario():
+        dao = get_dao()
+        user_id = uuid.uuid4()
+        legacy_token = await set_baseline_token(dao, user_id)
+        assert await dao.count_legacy_tokens() == 1
+
+        assert [key async for key in dao.migrate_legacy_tokens()] == [f'{legacy_token},{user_id}']
+        assert await dao.count_legacy_tokens() == 0
+        assert await dao.is_migrated()
+        assert await dao.redis_session.connection.ttl(dao.family_key(user_id, legacy_token)) <= 60
+
+        refresh_token, payload = await dao.rotate_refresh_token(legacy_token)
+        assert payload.user_id == user_id and payload.role == 'CLIENT'
+        assert dao.parse_family_token(refresh_token)[1] == legacy_token
+        assert (await dao.rotate_refresh_token(refresh_token))[0] is not None
+
+    asyncio.run(scenario())
+
+
+def test_migrated_token_reuse_revokes_family(monkeypatch):
+    async def scenario():
+        dao = get_dao()
+        legacy_token = await set_baseline_token(dao, uuid.uuid4())
+        async for _ in dao.migrate_legacy_tokens():
+            pass
+
+        refresh_token, _ = await dao.rotate_refresh_token(legacy_token)
+        with pytest.raises(HTTPException) as exception_info:
+            await dao.rotate_refresh_token(legacy_token)
+        assert_reused(exception_info)
+        assert await dao.rotate_refresh_token(refresh_token) == (None, None)
+
+    monkeypatch.setattr(AUTH_CONFIG, 'refresh_reuse_grace_sec', 0)
+    asyncio.run(scenario())
+
+
+def test_migration_keeps_newer_session():
+    async def scenario():
+        dao = get_dao()
+        user_id = uuid.uuid4()
+        legacy_token = await set_baseline_token(dao, user_id)
+        refresh_token = await dao.create_refresh_token(user_id, 'CLIENT')
+
+        async for _ in dao.migrate_legacy_tokens():
+            pass
+        assert await dao.rotate_refresh_token(legacy_token) == (None, None)
+        assert (await dao.rotate_refresh_token(refresh_token))[0] is not None
+
+    asyncio.run(scenario())
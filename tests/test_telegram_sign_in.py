@@ -0,0 +1,22 @@
+import asyncio
+import uuid
+
+import pytest
+
+from src.domain.authentication import service
+from src.domain.authentication.dto import TelegramSignInDTO
+from src.domain.user.dto import UserRoleDTO
+
+
+def test_cached_telegram_user_skips_postgres(monkeypatch: pytest.MonkeyPatch):
+    user = UserRoleDTO(id=uuid.uuid4(), role='CLIENT')
+
+    async def get(tg_id: int) -> UserRoleDTO:
+        return user
+
+    def session():
+        raise AssertionError('Postgres session opened on a cache hit.')
+
+    monkeypatch.setattr(service.TELEGRAM_CACHE, 'get', get)
+    monkeypatch.setattr(service, 'Session', session)
+    assert asyncio.run(service.validate_telegram_user(TelegramSignInDTO(tg_id=1))) is user